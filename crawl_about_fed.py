@@ -13,7 +13,7 @@ BASE_URL = "https://www.federalreserve.gov"
 START_URL = f"{BASE_URL}/aboutthefed.htm"
 SAVE_DIR = "about_the_fed_pages"
 MAX_PAGES = 1500
-CONCURRENCY = 10
+CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "16"))
 SEEN = set()
 
 FAQ_MAIN_URL = f"{BASE_URL}/faqs.htm"
@@ -261,25 +261,27 @@ async def faq_worker(queue, session):
         queue.task_done()
 
 async def main():
+    # Reset visited sets so repeated runs in a long-lived process crawl again
+    SEEN.clear()
+    FAQ_SEEN.clear()
+
     # Create SSL context with certifi certificates
     ssl_context = ssl.create_default_context(cafile=certifi.where())
 
-    queue = asyncio.Queue()
-    await queue.put(START_URL)
-
-    # Create connector with SSL context
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+    # One session (and connection pool) for both crawls; the connector caps
+    # open connections to federalreserve.gov at the worker count
+    connector = aiohttp.TCPConnector(ssl=ssl_context, limit_per_host=CONCURRENCY)
     async with aiohttp.ClientSession(connector=connector) as session:
+        queue = asyncio.Queue()
+        await queue.put(START_URL)
         tasks = [asyncio.create_task(worker(queue, session)) for _ in range(CONCURRENCY)]
         await queue.join()
         for task in tasks:
             task.cancel()
 
-    # FAQ crawl (separate run)
-    faq_queue = asyncio.Queue()
-    await faq_queue.put(FAQ_MAIN_URL)
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    async with aiohttp.ClientSession(connector=connector) as session:
+        # FAQ crawl (separate run)
+        faq_queue = asyncio.Queue()
+        await faq_queue.put(FAQ_MAIN_URL)
         faq_tasks = [asyncio.create_task(faq_worker(faq_queue, session)) for _ in range(CONCURRENCY)]
         await faq_queue.join()
         for task in faq_tasks:
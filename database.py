@@ -3,67 +3,388 @@ Database connection and operations for RAG system.
 """
 import os
 import json
+import threading
+from functools import lru_cache
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor, execute_values
-from typing import List, Dict, Optional, Any
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from typing import List, Dict, Optional, Any, Tuple
 from dotenv import load_dotenv
 import numpy as np
 from urllib.parse import urlparse
 
 load_dotenv()
 
+# Analytics dashboard aggregates. Each entry is materialized by
+# migrations/schema_update_analytics_views.sql; the SQL here mirrors the view
+# definition and is used as a live fallback when the view has not been created.
+ANALYTICS_VIEWS = {
+    'mv_rating_distribution': """
+        SELECT rating, COUNT(*) as count
+        FROM feedback
+        GROUP BY rating
+    """,
+    'mv_query_timeline_30d': """
+        SELECT DATE(created_at) as date, COUNT(*) as count
+        FROM queries
+        GROUP BY DATE(created_at)
+        ORDER BY date DESC
+        LIMIT 30
+    """,
+    'mv_category_breakdown': """
+        SELECT category, COUNT(*) as count
+        FROM queries
+        WHERE category IS NOT NULL
+        GROUP BY category
+    """,
+    'mv_issue_distribution': """
+        SELECT issue, COUNT(*) as count
+        FROM feedback
+        CROSS JOIN UNNEST(issues) as issue
+        WHERE issues IS NOT NULL
+          AND array_length(issues, 1) > 0
+          AND issue != 'none'
+        GROUP BY issue
+        ORDER BY count DESC
+        LIMIT 8
+    """,
+    'mv_severity_distribution': """
+        SELECT severity, COUNT(*) as count
+        FROM feedback
+        WHERE severity IS NOT NULL AND severity != 'none'
+        GROUP BY severity
+    """,
+}
+
+# Display-ready feedback rows for the response dialog. Created as a view by
+# migrations/schema_update_feedback_display.sql; mirrored here as a live fallback
+# for databases where that migration has not been applied yet.
+FEEDBACK_DISPLAY_VIEW = """
+    SELECT
+        id,
+        response_id,
+        rating,
+        COALESCE(comment, '') as comment,
+        comment IS NOT NULL AND comment != '' as has_comment,
+        created_at,
+        to_char(created_at, 'MM/DD/YYYY HH12:MI AM') as created_at_str,
+        CASE severity
+            WHEN 'severe' THEN '🚨'
+            WHEN 'moderate' THEN '⚠️'
+            WHEN 'minor' THEN '⚡'
+            ELSE ''
+        END as severity_emoji,
+        INITCAP(sentiment) as sentiment_label,
+        NULLIF(INITCAP(REPLACE(array_to_string(array_remove(issues, 'none'), ', '), '_', ' ')), '') as issues_str
+    FROM feedback
+"""
+
+# Hot, parameterless dashboard reads run through Database.execute_prepared, which
+# PREPAREs each statement once per connection and EXECUTEs it afterwards.
+PREPARED_QUERIES = {
+    'refresh_log_q': """
+        SELECT
+            source_type,
+            documents_added,
+            documents_deleted,
+            refresh_started,
+            refresh_completed,
+            EXTRACT(EPOCH FROM (refresh_completed - refresh_started))::float as duration_s,
+            status,
+            error_message
+        FROM source_refresh_log
+        WHERE source_type <> 'manual_refresh'
+        ORDER BY refresh_started DESC
+        LIMIT 20
+    """,
+    'sample_docs_q': """
+        SELECT
+            source_type,
+            source_title,
+            source_url,
+            preview,
+            last_refreshed
+        FROM documents
+        WHERE is_external_source = TRUE
+        ORDER BY last_refreshed DESC
+        LIMIT 10
+    """,
+    'data_counts_q': """
+        SELECT
+            (SELECT COUNT(*) FROM responses) as r,
+            (SELECT COUNT(*) FROM feedback) as f,
+            (SELECT COUNT(*) FROM queries) as q
+    """,
+}
+
+# Equivalent queries for PREPARED_QUERIES that read columns added by a migration,
+# used when that migration has not been applied yet
+PREPARED_FALLBACKS = {
+    # documents.preview comes from migrations/schema_update_document_preview.sql
+    'sample_docs_q': PREPARED_QUERIES['sample_docs_q'].replace(
+        'preview,', 'LEFT(content, 200) as preview,'
+    ),
+}
+
+# Supabase's transaction-mode pooler (Supavisor) listens on this port and does not
+# keep server sessions between transactions, so named prepared statements can't be used
+SUPABASE_TRANSACTION_POOLER_PORT = 6543
+
+# "Refresh Now" claims: source_refresh_log rows with this source_type mark a crawl in progress
+# (refresh_log_q leaves them out of the refresh history)
+REFRESH_CLAIM_SOURCE = 'manual_refresh'
+REFRESH_CLAIM_TIMEOUT_MINUTES = 60
+
+# Seconds to wait after a write before refreshing the analytics views
+ANALYTICS_REFRESH_DELAY = float(os.getenv('ANALYTICS_REFRESH_DELAY_SECONDS', '60'))
+
+_analytics_refresh_timer = None
+_analytics_refresh_lock = threading.Lock()
+
+
+def fetch_analytics_views(cursor, views: List[Tuple[str, str]]) -> List[List[tuple]]:
+    """
+    Read several analytics views in a single round trip.
+
+    Each view is aggregated into a JSON array server-side, so one statement
+    returns every result set. Falls back to running each view's defining query
+    (ANALYTICS_VIEWS) live if the materialized views do not exist yet
+    (migration not applied).
+
+    Args:
+        cursor: Open cursor to read with (any cursor factory)
+        views: (view, order_by) pairs; order_by may be an empty string
+
+    Returns:
+        One list of row tuples (in column order) per requested view.
+    """
+    def build_query(sources):
+        columns = ", ".join(
+            f"(SELECT COALESCE(json_agg(t {order_by}), '[]'::json) FROM {source} t) as r{i}"
+            for i, (source, order_by) in enumerate(sources)
+        )
+        return f"SELECT {columns};"
+
+    try:
+        cursor.execute(build_query(views))
+    except psycopg2.errors.UndefinedTable:
+        cursor.connection.rollback()
+        cursor.execute(build_query([(f"({ANALYTICS_VIEWS[view]})", order_by) for view, order_by in views]))
+
+    row = cursor.fetchone()
+    results = row.values() if isinstance(row, dict) else row
+    return [[tuple(item.values()) for item in result] for result in results]
+
+
+def _run_analytics_refresh():
+    """Timer callback: refresh the analytics views on a dedicated connection."""
+    global _analytics_refresh_timer
+    with _analytics_refresh_lock:
+        _analytics_refresh_timer = None
+
+    try:
+        with Database() as db:
+            db.refresh_analytics_views()
+    except Exception as e:
+        print(f"Warning: Could not refresh analytics views: {e}")
+
+
+def schedule_analytics_refresh(delay: Optional[float] = None) -> None:
+    """
+    Refresh the analytics materialized views shortly after a write.
+
+    Calls made while a refresh is already pending are coalesced, so a burst of
+    writes costs a single REFRESH and the dashboard lags by at most `delay`.
+    """
+    global _analytics_refresh_timer
+    with _analytics_refresh_lock:
+        if _analytics_refresh_timer is not None:
+            return
+        _analytics_refresh_timer = threading.Timer(
+            ANALYTICS_REFRESH_DELAY if delay is None else delay,
+            _run_analytics_refresh
+        )
+        _analytics_refresh_timer.daemon = True
+        _analytics_refresh_timer.start()
+
+
+class TrackedConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+# Connections are reused across Database instances (and Streamlit reruns) through
+# one pool per set of connection parameters
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+
+_pools: Dict[tuple, ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(conn_params: Dict[str, Any]) -> ThreadedConnectionPool:
+    """Return the shared connection pool for these connection parameters, creating it on first use."""
+    key = tuple(sorted((k, str(v)) for k, v in conn_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ThreadedConnectionPool(
+                DB_POOL_MIN, DB_POOL_MAX,
+                connection_factory=TrackedConnection,
+                **conn_params
+            )
+            _pools[key] = pool
+        return pool
+
+
+@lru_cache(maxsize=1)
+def resolve_connection() -> Tuple[str, Dict[str, Any]]:
+    """
+    Resolve the database mode and connection parameters from the environment.
+
+    Every Database() (one or more per Streamlit rerun) needs the same parameters,
+    so the environment is read and SUPABASE_URL parsed once per process.
+    Treat the returned dict as read-only; Database copies it.
+
+    Returns:
+        ('supabase' or 'local', psycopg2 connection keyword arguments)
+    """
+    # Check DATABASE_MODE to determine which database to use
+    db_mode = os.getenv('DATABASE_MODE', 'local').lower()
+
+    if db_mode == 'supabase':
+        # Use Supabase
+        supabase_url = os.getenv('SUPABASE_URL')
+        if not supabase_url:
+            raise ValueError("SUPABASE_URL not set in .env file")
+
+        # Parse the Supabase URL
+        parsed = urlparse(supabase_url)
+        conn_params = {
+            'host': parsed.hostname,
+            'port': parsed.port,
+            'database': parsed.path[1:],  # Remove leading '/'
+            'user': parsed.username,
+            'password': parsed.password
+        }
+    else:
+        # Use local PostgreSQL (default)
+        db_mode = 'local'
+        conn_params = {
+            'host': os.getenv('LOCAL_DB_HOST', 'localhost'),
+            'port': os.getenv('LOCAL_DB_PORT', '5433'),
+            'database': os.getenv('LOCAL_DB_NAME', 'rag_system'),
+            'user': os.getenv('LOCAL_DB_USER', 'rag_user'),
+            'password': os.getenv('LOCAL_DB_PASSWORD', '')
+        }
+
+    # Name the client so its sessions are identifiable in pg_stat_activity, and fail
+    # fast on an unreachable host instead of waiting for the OS TCP timeout
+    conn_params['application_name'] = os.getenv('DB_APPLICATION_NAME', 'fed-rag')
+    conn_params['connect_timeout'] = int(os.getenv('DB_CONNECT_TIMEOUT', '3'))
+
+    return db_mode, conn_params
+
 
 class Database:
     """Database connection and query handler."""
 
     def __init__(self):
         """Initialize database connection."""
-        # Check DATABASE_MODE to determine which database to use
-        db_mode = os.getenv('DATABASE_MODE', 'local').lower()
-
-        if db_mode == 'supabase':
-            # Use Supabase
-            supabase_url = os.getenv('SUPABASE_URL')
-            if not supabase_url:
-                raise ValueError("SUPABASE_URL not set in .env file")
-
-            # Parse the Supabase URL
-            parsed = urlparse(supabase_url)
-            self.conn_params = {
-                'host': parsed.hostname,
-                'port': parsed.port,
-                'database': parsed.path[1:],  # Remove leading '/'
-                'user': parsed.username,
-                'password': parsed.password
-            }
-            self.db_mode = 'supabase'
-        else:
-            # Use local PostgreSQL (default)
-            self.conn_params = {
-                'host': os.getenv('LOCAL_DB_HOST', 'localhost'),
-                'port': os.getenv('LOCAL_DB_PORT', '5433'),
-                'database': os.getenv('LOCAL_DB_NAME', 'rag_system'),
-                'user': os.getenv('LOCAL_DB_USER', 'rag_user'),
-                'password': os.getenv('LOCAL_DB_PASSWORD', '')
-            }
-            self.db_mode = 'local'
+        db_mode, conn_params = resolve_connection()
+        # Copy so callers may adjust their own parameters without touching the cached ones
+        self.conn_params = dict(conn_params)
+        self.db_mode = db_mode
+
+        # A transaction-mode pooler hands each transaction to any server session, so
+        # session state (named prepared statements) can't be relied on
+        self.transaction_pooler = str(self.conn_params['port']) == str(SUPABASE_TRANSACTION_POOLER_PORT)
+        self.use_prepared = not self.transaction_pooler
 
         self.conn = None
         self.cursor = None
+        self._pool = None
 
     def connect(self):
-        """Establish database connection."""
+        """Check out a connection from the shared pool (or open one if the pool is exhausted)."""
         if not self.conn or self.conn.closed:
-            # conn_params is now always a dict
-            self.conn = psycopg2.connect(**self.conn_params)
+            try:
+                self._pool = get_pool(self.conn_params)
+                self.conn = self._pool.getconn()
+                try:
+                    # psycopg2 only marks a connection closed after an operation on it
+                    # fails, so probe it: the server (or the Supabase pooler's idle
+                    # timeout) may have dropped it while it sat in the pool
+                    with self.conn.cursor() as probe:
+                        probe.execute("SELECT 1;")
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    # Discard the dead connection and retry once with a fresh one
+                    self._pool.putconn(self.conn, close=True)
+                    self.conn = self._pool.getconn()
+            except PoolError:
+                print("Warning: Connection pool exhausted, opening a direct connection")
+                self._pool = None
+                self.conn = psycopg2.connect(**self.conn_params, connection_factory=TrackedConnection)
             self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
 
+    def new_cursor(self, cursor_factory=None):
+        """
+        Open an extra cursor on this connection.
+
+        self.cursor returns RealDictCursor rows; bulk reads that only index
+        columns by position can use the default tuple cursor instead and skip
+        building a dict per row.
+
+        Args:
+            cursor_factory: Optional psycopg2 cursor class (default: tuple rows)
+        """
+        self.connect()
+        return self.conn.cursor(cursor_factory=cursor_factory)
+
+    def fetch_batch(self, queries: List[str]) -> List[List[Dict]]:
+        """
+        Run several independent read queries in a single round trip.
+
+        Each query's rows are aggregated into a JSON array server-side, so one
+        statement returns every result set (the psycopg2 counterpart of a
+        pipelined batch). Values come back as JSON types: timestamps are ISO
+        strings, so format dates in SQL where the caller displays them.
+        Row order follows each query's ORDER BY.
+
+        Args:
+            queries: SELECT statements without parameters or trailing semicolons
+
+        Returns:
+            One list of dict rows per query, in the same order.
+        """
+        self.connect()
+        columns = ", ".join(
+            f"(SELECT COALESCE(json_agg(t), '[]'::json) FROM ({query}) t) as r{i}"
+            for i, query in enumerate(queries)
+        )
+        cursor = self.new_cursor()
+        cursor.execute(f"SELECT {columns};")
+        results = list(cursor.fetchone())
+        cursor.close()
+        return results
+
     def close(self):
-        """Close database connection."""
+        """Return the connection to the pool (or close it if it was opened directly)."""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
+            if self._pool is not None:
+                # putconn rolls back any open transaction before pooling the connection
+                self._pool.putconn(self.conn, close=self.conn.closed != 0)
+            else:
+                self.conn.close()
+            self.conn = None
 
     def __enter__(self):
         """Context manager entry."""
@@ -78,6 +399,75 @@ class Database:
             self.conn.rollback()
         self.close()
 
+    def execute_prepared(self, name: str) -> None:
+        """Execute one of PREPARED_QUERIES, preparing it on first use per connection.
+
+        Only pooled connections prepare: they are reused, so later calls only EXECUTE.
+        Falls back to plain execution on a one-off direct connection (pool exhausted)
+        or when connected through a transaction pooler. Queries listed in
+        PREPARED_FALLBACKS run their fallback if the schema is missing a migration.
+        """
+        self.connect()
+
+        try:
+            if not self.use_prepared or self._pool is None:
+                self.cursor.execute(PREPARED_QUERIES[name])
+                return
+
+            if name not in self.conn.prepared:
+                # Only a failed PREPARE leaves the name unprepared; once created, the statement
+                # is session state that survives ROLLBACK, so a failed EXECUTE must not forget it
+                self.cursor.execute(f"PREPARE {name} AS {PREPARED_QUERIES[name]}")
+                self.conn.prepared.add(name)
+            self.cursor.execute(f"EXECUTE {name}")
+        except (psycopg2.errors.UndefinedColumn, psycopg2.errors.UndefinedTable):
+            if name not in PREPARED_FALLBACKS:
+                raise
+            self.conn.rollback()
+            self.cursor.execute(PREPARED_FALLBACKS[name])
+
+    def claim_refresh(self) -> Optional[int]:
+        """Claim the single content-refresh slot; returns the claim id, or None if a refresh is running.
+
+        The claim is an 'in_progress' row in source_refresh_log, so it works through the
+        transaction pooler (no session state). A transaction-scoped advisory lock makes the
+        check-and-insert atomic across sessions. Claims older than REFRESH_CLAIM_TIMEOUT_MINUTES
+        are treated as abandoned (e.g. the app restarted mid-crawl) and marked failed.
+        """
+        self.connect()
+
+        self.cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s));", (REFRESH_CLAIM_SOURCE,))
+        self.cursor.execute("""
+            UPDATE source_refresh_log
+            SET status = 'failed', refresh_completed = NOW(), error_message = 'Abandoned refresh claim'
+            WHERE source_type = %s
+              AND status = 'in_progress'
+              AND refresh_started < NOW() - make_interval(mins => %s);
+        """, (REFRESH_CLAIM_SOURCE, REFRESH_CLAIM_TIMEOUT_MINUTES))
+        self.cursor.execute("""
+            INSERT INTO source_refresh_log (source_type, refresh_started, status)
+            SELECT %s, NOW(), 'in_progress'
+            WHERE NOT EXISTS (
+                SELECT 1 FROM source_refresh_log
+                WHERE source_type = %s AND status = 'in_progress'
+            )
+            RETURNING id;
+        """, (REFRESH_CLAIM_SOURCE, REFRESH_CLAIM_SOURCE))
+        row = self.cursor.fetchone()
+        # Commit releases the transaction lock and publishes the claim to other sessions
+        self.conn.commit()
+        return row['id'] if row else None
+
+    def release_refresh(self, claim_id: int, error: Optional[str] = None) -> None:
+        """Close a claim taken with claim_refresh(), recording whether the refresh failed."""
+        self.connect()
+        self.cursor.execute("""
+            UPDATE source_refresh_log
+            SET status = %s, refresh_completed = NOW(), error_message = %s
+            WHERE id = %s;
+        """, ('failed' if error else 'completed', error, claim_id))
+        self.conn.commit()
+
     def add_document(self, content: str, embedding: np.ndarray, metadata: Optional[Dict] = None) -> int:
         """Add a document to the database."""
         self.connect()
@@ -172,6 +562,15 @@ class Database:
         self.cursor.execute(query, (feedback_weight, embedding_list, embedding_list, feedback_weight, top_k))
         return self.cursor.fetchall()
 
+    def documents_exist(self, doc_ids: List[int]) -> bool:
+        """Return True if every id in doc_ids is still in the documents table."""
+        self.connect()
+        self.cursor.execute(
+            "SELECT COUNT(*) as count FROM documents WHERE id = ANY(%s);",
+            (list(set(doc_ids)),)
+        )
+        return self.cursor.fetchone()['count'] == len(set(doc_ids))
+
     def add_query(self, query_text: str, query_embedding: np.ndarray, category: Optional[str] = None,
                   has_pii: bool = False, redaction_count: int = 0,
                   redaction_details: Optional[Dict] = None) -> int:
@@ -278,6 +677,67 @@ class Database:
 
         return feedback_id
 
+    def add_feedback_batch(self, rows: List[Tuple[int, int, Optional[str], Optional[Dict]]]) -> List[int]:
+        """Add several feedback rows in one INSERT.
+
+        Args:
+            rows: (response_id, rating, comment, analysis) tuples, as for add_feedback.
+
+        Returns:
+            Feedback IDs, in the same order as rows.
+        """
+        if not rows:
+            return []
+
+        self.connect()
+
+        values = []
+        for response_id, rating, comment, analysis in rows:
+            if not (1 <= rating <= 5):
+                raise ValueError("Rating must be between 1 and 5")
+
+            if not analysis:
+                values.append((response_id, rating, comment, None, None, None, None, None))
+                continue
+
+            # Convert sentiment_score (float) to sentiment (string) if needed
+            sentiment = analysis.get('sentiment')
+            if not sentiment and 'sentiment_score' in analysis:
+                score = analysis['sentiment_score']
+                if score > 0.2:
+                    sentiment = 'positive'
+                elif score < -0.2:
+                    sentiment = 'negative'
+                else:
+                    sentiment = 'neutral'
+            else:
+                sentiment = sentiment or 'neutral'
+
+            values.append((
+                response_id, rating, comment,
+                sentiment,
+                analysis.get('issues', analysis.get('issue_types', [])),
+                analysis.get('severity', 'none'),
+                analysis.get('confidence', 0.0),
+                analysis.get('summary', analysis.get('analysis_summary', ''))
+            ))
+
+        result = execute_values(
+            self.cursor,
+            """
+            INSERT INTO feedback (response_id, rating, comment, sentiment,
+                                issues, severity, confidence, summary)
+            VALUES %s
+            RETURNING id
+            """,
+            values,
+            page_size=100,
+            fetch=True
+        )
+        self.conn.commit()
+
+        return [row['id'] for row in result]
+
     def update_feedback_analysis(self, feedback_id: int, analysis: Dict) -> None:
         """Update feedback with comment analysis results."""
         self.connect()
@@ -549,18 +1009,18 @@ class Database:
         analytics['total_feedback'] = self.cursor.fetchone()['count']
 
         # Average rating
-        self.cursor.execute("SELECT AVG(rating) as avg_rating FROM feedback;")
+        self.cursor.execute("SELECT AVG(rating)::float as avg_rating FROM feedback;")
         result = self.cursor.fetchone()
-        analytics['average_rating'] = float(result['avg_rating']) if result['avg_rating'] else 0.0
+        analytics['average_rating'] = result['avg_rating'] or 0.0
 
         # Recent feedback (last 7 days)
         self.cursor.execute("""
-            SELECT AVG(rating) as avg_rating, COUNT(*) as count
+            SELECT AVG(rating)::float as avg_rating, COUNT(*) as count
             FROM feedback
             WHERE created_at > CURRENT_TIMESTAMP - INTERVAL '7 days';
         """)
         recent = self.cursor.fetchone()
-        analytics['recent_avg_rating'] = float(recent['avg_rating']) if recent['avg_rating'] else 0.0
+        analytics['recent_avg_rating'] = recent['avg_rating'] or 0.0
         analytics['recent_feedback_count'] = recent['count']
 
         # Top rated documents
@@ -578,6 +1038,27 @@ class Database:
 
         return analytics
 
+    def refresh_analytics_views(self) -> None:
+        """Refresh all analytics materialized views without blocking readers."""
+        self.connect()
+
+        for view in ANALYTICS_VIEWS:
+            self.cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view};")
+        self.conn.commit()
+
+    def _refresh_analytics_after_delete(self) -> None:
+        """Refresh the analytics views right away after a delete.
+
+        Writes that add queries or feedback use the debounced schedule_analytics_refresh();
+        after a delete the page clears its caches and re-renders immediately, so the
+        charts must not keep showing the deleted rows until the timer fires.
+        """
+        try:
+            self.refresh_analytics_views()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Warning: Could not refresh analytics views: {e}")
+
     def get_category_statistics(self) -> List[Dict]:
         """Get query statistics by category."""
         self.connect()
@@ -631,7 +1112,7 @@ class Database:
                 r.created_at,
                 q.query_text,
                 q.id as query_id,
-                COALESCE(AVG(f.rating), 0) as avg_rating,
+                COALESCE(AVG(f.rating), 0)::float as avg_rating,
                 COUNT(f.id) as feedback_count,
                 COUNT(f.comment) FILTER (WHERE f.comment IS NOT NULL AND f.comment != '') as comments_count,
                 array_agg(
@@ -662,6 +1143,141 @@ class Database:
         self.cursor.execute(query, params)
         return self.cursor.fetchall()
 
+    def get_responses_summary(self, limit: int = 100,
+                              min_rating: Optional[int] = None,
+                              max_rating: Optional[int] = None,
+                              before: Optional[Tuple[Any, int]] = None) -> List[Dict]:
+        """Get the lightweight columns needed for the response list view.
+
+        Unlike get_all_responses, this skips response_text and the aggregated
+        feedback array; use get_response_details to load those for one response.
+
+        Pages are keyset-paginated: pass the (created_at, id) of the last row of
+        the previous page as ``before`` to get the next page.
+
+        Without a rating filter the page of response ids is picked first, straight
+        off idx_responses_created_at (Limit -> Index Scan), and feedback is only
+        aggregated for those ids, so a page costs the same however large the table
+        is. A rating filter depends on the aggregated feedback, so filtered pages
+        still aggregate every matching response before sorting.
+        """
+        self.connect()
+
+        conditions = []
+        params = []
+
+        if before is not None:
+            conditions.append("(r.created_at, r.id) < (%s, %s)")
+            params.extend(before)
+
+        if min_rating is None and max_rating is None:
+            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+            query = f"""
+                SELECT
+                    p.id,
+                    p.created_at,
+                    LEFT(q.query_text, 120) as query_text,
+                    fs.avg_rating,
+                    fs.feedback_count,
+                    fs.comments_count
+                FROM (
+                    SELECT r.id, r.created_at, r.query_id
+                    FROM responses r
+                    {where_clause}
+                    ORDER BY r.created_at DESC, r.id DESC
+                    LIMIT %s
+                ) p
+                JOIN queries q ON p.query_id = q.id
+                CROSS JOIN LATERAL (
+                    SELECT
+                        COALESCE(AVG(f.rating), 0)::float as avg_rating,
+                        COUNT(f.id) as feedback_count,
+                        COUNT(f.comment) FILTER (WHERE f.comment IS NOT NULL AND f.comment != '') as comments_count
+                    FROM feedback f
+                    WHERE f.response_id = p.id
+                ) fs
+                ORDER BY p.created_at DESC, p.id DESC;
+            """
+
+            params.append(limit)
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()
+
+        if min_rating is not None:
+            conditions.append("f.rating >= %s")
+            params.append(min_rating)
+
+        if max_rating is not None:
+            conditions.append("f.rating <= %s")
+            params.append(max_rating)
+
+        where_clause = "WHERE " + " AND ".join(conditions)
+
+        query = f"""
+            SELECT
+                r.id,
+                r.created_at,
+                LEFT(q.query_text, 120) as query_text,
+                COALESCE(AVG(f.rating), 0)::float as avg_rating,
+                COUNT(f.id) as feedback_count,
+                COUNT(f.comment) FILTER (WHERE f.comment IS NOT NULL AND f.comment != '') as comments_count
+            FROM responses r
+            JOIN queries q ON r.query_id = q.id
+            LEFT JOIN feedback f ON f.response_id = r.id
+            {where_clause}
+            GROUP BY r.id, q.query_text
+            ORDER BY r.created_at DESC, r.id DESC
+            LIMIT %s;
+        """
+
+        params.append(limit)
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    def get_response_details(self, response_id: int) -> Optional[Dict]:
+        """Get a full response row with rating summary and all feedback.
+
+        Feedback items come from the feedback_display view, already formatted for display
+        (or from its defining query if the view has not been created yet).
+        """
+        self.connect()
+
+        query = """
+            SELECT
+                r.id,
+                r.response_text,
+                r.model_version,
+                r.created_at,
+                q.query_text,
+                q.id as query_id,
+                COALESCE(AVG(f.rating), 0)::float as avg_rating,
+                COUNT(f.id) as feedback_count,
+                COUNT(f.comment) FILTER (WHERE f.comment IS NOT NULL AND f.comment != '') as comments_count,
+                array_agg(
+                    jsonb_build_object(
+                        'rating', f.rating,
+                        'comment', f.comment,
+                        'has_comment', f.has_comment,
+                        'created_at_str', f.created_at_str,
+                        'severity_emoji', f.severity_emoji,
+                        'sentiment_label', f.sentiment_label,
+                        'issues_str', f.issues_str
+                    ) ORDER BY f.created_at
+                ) FILTER (WHERE f.id IS NOT NULL) as all_feedback
+            FROM responses r
+            JOIN queries q ON r.query_id = q.id
+            LEFT JOIN {feedback_source} f ON f.response_id = r.id
+            WHERE r.id = %s
+            GROUP BY r.id, q.id, q.query_text;
+        """
+        try:
+            self.cursor.execute(query.format(feedback_source='feedback_display'), (response_id,))
+        except psycopg2.errors.UndefinedTable:
+            self.conn.rollback()
+            self.cursor.execute(query.format(feedback_source=f"({FEEDBACK_DISPLAY_VIEW})"), (response_id,))
+        return self.cursor.fetchone()
+
     def delete_response(self, response_id: int) -> bool:
         """Delete a response and its associated feedback."""
         self.connect()
@@ -674,6 +1290,7 @@ class Database:
             self.cursor.execute("DELETE FROM responses WHERE id = %s;", (response_id,))
 
             self.conn.commit()
+            self._refresh_analytics_after_delete()
             return True
         except Exception as e:
             self.conn.rollback()
@@ -699,6 +1316,7 @@ class Database:
 
             deleted_count = self.cursor.rowcount
             self.conn.commit()
+            self._refresh_analytics_after_delete()
             return deleted_count
         except Exception as e:
             self.conn.rollback()
@@ -727,12 +1345,39 @@ class Database:
 
             deleted_count = self.cursor.rowcount
             self.conn.commit()
+            self._refresh_analytics_after_delete()
             return deleted_count
         except Exception as e:
             self.conn.rollback()
             print(f"Error deleting old responses: {e}")
             return 0
 
+    def delete_low_rated_responses(self, max_rating: int) -> int:
+        """Delete responses that received any rating <= max_rating.
+
+        Feedback rows are removed by the ON DELETE CASCADE on feedback.response_id.
+        """
+        self.connect()
+
+        try:
+            self.cursor.execute("""
+                DELETE FROM responses
+                WHERE id IN (
+                    SELECT response_id FROM feedback WHERE rating <= %s
+                )
+                RETURNING id;
+            """, (max_rating,))
+
+            deleted_count = self.cursor.rowcount
+            self.conn.commit()
+            if deleted_count:
+                self._refresh_analytics_after_delete()
+            return deleted_count
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error deleting low-rated responses: {e}")
+            return 0
+
     def delete_all_user_data(self) -> Dict[str, int]:
         """
         Delete ALL user data including responses, queries, feedback, and feedback-derived data.
@@ -743,42 +1388,30 @@ class Database:
         """
         self.connect()
 
-        deleted_counts = {
-            'feedback': 0,
-            'responses': 0,
-            'queries': 0,
-            'document_flags': 0,
-            'document_scores': 0,
-            'source_document_scores': 0
-        }
-
         try:
-            # Delete in order of foreign key dependencies
-            # 1. Delete feedback (references responses)
-            self.cursor.execute("DELETE FROM feedback;")
-            deleted_counts['feedback'] = self.cursor.rowcount
-
-            # 2. Delete responses (references queries)
-            self.cursor.execute("DELETE FROM responses;")
-            deleted_counts['responses'] = self.cursor.rowcount
-
-            # 3. Delete queries (no dependencies)
-            self.cursor.execute("DELETE FROM queries;")
-            deleted_counts['queries'] = self.cursor.rowcount
-
-            # 4. Delete document review flags (feedback-derived)
-            self.cursor.execute("DELETE FROM document_review_flags;")
-            deleted_counts['document_flags'] = self.cursor.rowcount
-
-            # 5. Reset chunk-level document scores (legacy - remove feedback-based rankings)
-            self.cursor.execute("DELETE FROM document_scores;")
-            deleted_counts['document_scores'] = self.cursor.rowcount
-
-            # 6. Reset URL-level document scores (remove feedback-based rankings)
-            self.cursor.execute("DELETE FROM source_document_scores;")
-            deleted_counts['source_document_scores'] = self.cursor.rowcount
+            # All six deletes run in one statement (one round trip). Every CTE sees the
+            # same snapshot, and foreign-key cascades fire at the end of the statement,
+            # after the referencing rows are already gone.
+            self.cursor.execute("""
+                WITH
+                    del_feedback AS (DELETE FROM feedback RETURNING 1),
+                    del_responses AS (DELETE FROM responses RETURNING 1),
+                    del_queries AS (DELETE FROM queries RETURNING 1),
+                    del_flags AS (DELETE FROM document_review_flags RETURNING 1),
+                    del_doc_scores AS (DELETE FROM document_scores RETURNING 1),
+                    del_source_scores AS (DELETE FROM source_document_scores RETURNING 1)
+                SELECT
+                    (SELECT COUNT(*) FROM del_feedback) as feedback,
+                    (SELECT COUNT(*) FROM del_responses) as responses,
+                    (SELECT COUNT(*) FROM del_queries) as queries,
+                    (SELECT COUNT(*) FROM del_flags) as document_flags,
+                    (SELECT COUNT(*) FROM del_doc_scores) as document_scores,
+                    (SELECT COUNT(*) FROM del_source_scores) as source_document_scores;
+            """)
+            deleted_counts = dict(self.cursor.fetchone())
 
             self.conn.commit()
+            self._refresh_analytics_after_delete()
             return deleted_counts
         except Exception as e:
             self.conn.rollback()
@@ -5,20 +5,20 @@ Crawls, processes, and imports Federal Reserve content into the RAG system
 import os
 import sys
 import asyncio
+import csv
+import io
 import psycopg2
-from psycopg2.extras import execute_batch, Json
 from dotenv import load_dotenv
 from datetime import datetime
 from pathlib import Path
 import re
 import json
-from pgvector.psycopg2 import register_vector
-from urllib.parse import urlparse
 
 # Script directory
 script_dir = Path(__file__).parent
 
 from embeddings import EmbeddingService
+from database import resolve_connection
 
 load_dotenv()
 
@@ -27,35 +27,10 @@ class FedContentImporter:
 
     def __init__(self):
         """Initialize the importer."""
-        # Use DATABASE_MODE to determine connection params
-        db_mode = os.getenv('DATABASE_MODE', 'local').lower()
-
-        if db_mode == 'supabase':
-            # Use Supabase
-            supabase_url = os.getenv('SUPABASE_URL')
-            if not supabase_url:
-                raise ValueError("SUPABASE_URL not set in .env file")
-
-            # Parse the Supabase URL
-            parsed = urlparse(supabase_url)
-            self.db_params = {
-                'host': parsed.hostname,
-                'port': parsed.port,
-                'database': parsed.path[1:],  # Remove leading '/'
-                'user': parsed.username,
-                'password': parsed.password
-            }
-            self.db_mode = 'supabase'
-        else:
-            # Use local PostgreSQL (default)
-            self.db_params = {
-                'host': os.getenv('LOCAL_DB_HOST', 'localhost'),
-                'port': os.getenv('LOCAL_DB_PORT', '5433'),
-                'database': os.getenv('LOCAL_DB_NAME', 'rag_system'),
-                'user': os.getenv('LOCAL_DB_USER', 'rag_user'),
-                'password': os.getenv('LOCAL_DB_PASSWORD', '')
-            }
-            self.db_mode = 'local'
+        # Same DATABASE_MODE resolution as the app (parsed once per process)
+        db_mode, db_params = resolve_connection()
+        self.db_params = dict(db_params)
+        self.db_mode = db_mode
 
         self.embeddings = EmbeddingService()
         self.chunk_size = 500  # characters per chunk
@@ -205,7 +180,6 @@ class FedContentImporter:
     def _store_chunks(self, chunks, source_type):
         """Store chunks in database, replacing existing content from this source."""
         conn = self.get_connection()
-        register_vector(conn)  # Register pgvector types
         cursor = conn.cursor()
 
         try:
@@ -217,29 +191,37 @@ class FedContentImporter:
             deleted_count = cursor.rowcount
             print(f"   Deleted {deleted_count} existing documents for {source_type}")
 
-            # Insert new documents
-            insert_query = """
-                INSERT INTO documents (
-                    content, embedding, metadata, source_type, source_url,
-                    source_title, is_external_source, last_refreshed
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, TRUE, %s)
-            """
-
-            data = [
-                (
+            # Bulk load new documents with COPY (one statement instead of per-row INSERTs).
+            # Values use Postgres text input formats: '[x,y,...]' for vector, JSON text for JSONB.
+            refreshed_at = datetime.utcnow().isoformat()
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            for chunk in chunks:
+                embedding = chunk['embedding']
+                if hasattr(embedding, 'tolist'):
+                    embedding = embedding.tolist()
+                writer.writerow((
                     chunk['content'],
-                    chunk['embedding'].tolist() if hasattr(chunk['embedding'], 'tolist') else chunk['embedding'],
-                    Json(chunk['metadata']),  # Wrap in Json() for JSONB
+                    '[' + ','.join(map(str, embedding)) + ']',
+                    json.dumps(chunk['metadata']),
                     source_type,
                     chunk['metadata'].get('source_url'),
                     chunk['metadata'].get('source_title'),
-                    datetime.utcnow()
-                )
-                for chunk in chunks
-            ]
+                    't',
+                    refreshed_at
+                ))
+            buffer.seek(0)
 
-            execute_batch(cursor, insert_query, data, page_size=100)
+            cursor.copy_expert(
+                """
+                COPY documents (
+                    content, embedding, metadata, source_type, source_url,
+                    source_title, is_external_source, last_refreshed
+                )
+                FROM STDIN WITH (FORMAT csv)
+                """,
+                buffer
+            )
             conn.commit()
 
             print(f"   ✓ Inserted {len(chunks)} new document chunks")
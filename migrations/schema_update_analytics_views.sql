@@ -0,0 +1,58 @@
+-- Schema Update: Analytics Materialized Views
+-- Pre-aggregates the Analytics dashboard charts so a page render reads a handful of
+-- summary rows instead of re-scanning queries/feedback on every visit.
+-- The application refreshes these views (debounced) after new queries and feedback.
+-- Keep the SELECTs in sync with ANALYTICS_VIEWS in database.py.
+
+-- Rating distribution (1-5 stars)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_rating_distribution AS
+SELECT rating, COUNT(*) as count
+FROM feedback
+GROUP BY rating;
+
+-- Queries per day (most recent 30 days with activity)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_query_timeline_30d AS
+SELECT DATE(created_at) as date, COUNT(*) as count
+FROM queries
+GROUP BY DATE(created_at)
+ORDER BY date DESC
+LIMIT 30;
+
+-- Query category breakdown
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_category_breakdown AS
+SELECT category, COUNT(*) as count
+FROM queries
+WHERE category IS NOT NULL
+GROUP BY category;
+
+-- Most common feedback issues (top 8)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_issue_distribution AS
+SELECT issue, COUNT(*) as count
+FROM feedback
+CROSS JOIN UNNEST(issues) as issue
+WHERE issues IS NOT NULL
+  AND array_length(issues, 1) > 0
+  AND issue != 'none'
+GROUP BY issue
+ORDER BY count DESC
+LIMIT 8;
+
+-- Feedback severity distribution
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_severity_distribution AS
+SELECT severity, COUNT(*) as count
+FROM feedback
+WHERE severity IS NOT NULL AND severity != 'none'
+GROUP BY severity;
+
+-- Unique indexes are required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_rating_distribution ON mv_rating_distribution(rating);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_query_timeline_30d ON mv_query_timeline_30d(date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_category_breakdown ON mv_category_breakdown(category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_issue_distribution ON mv_issue_distribution(issue);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_severity_distribution ON mv_severity_distribution(severity);
+
+COMMENT ON MATERIALIZED VIEW mv_rating_distribution IS 'Analytics dashboard: feedback count per rating (refreshed by the app)';
+COMMENT ON MATERIALIZED VIEW mv_query_timeline_30d IS 'Analytics dashboard: queries per day for the 30 most recent active days';
+COMMENT ON MATERIALIZED VIEW mv_category_breakdown IS 'Analytics dashboard: query count per category';
+COMMENT ON MATERIALIZED VIEW mv_issue_distribution IS 'Analytics dashboard: top 8 issue types from feedback analysis';
+COMMENT ON MATERIALIZED VIEW mv_severity_distribution IS 'Analytics dashboard: feedback count per severity';
@@ -0,0 +1,7 @@
+-- Add a stored preview column to documents
+-- The Source Content page lists the first 200 characters of recently refreshed documents.
+-- Storing the prefix avoids detoasting the full content column just to display a snippet.
+-- (Generated columns require PostgreSQL 12+.)
+
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS preview TEXT GENERATED ALWAYS AS (LEFT(content, 200)) STORED;
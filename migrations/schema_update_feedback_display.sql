@@ -0,0 +1,25 @@
+-- Feedback display view
+-- Pre-formats the per-feedback fields shown in the Data Management response dialog
+-- (date string, severity emoji, sentiment label, issues list) so the app only renders them.
+-- Keep the formatting in sync with FEEDBACK_DISPLAY_VIEW in database.py (the live fallback).
+
+CREATE OR REPLACE VIEW feedback_display AS
+SELECT
+    id,
+    response_id,
+    rating,
+    COALESCE(comment, '') as comment,
+    comment IS NOT NULL AND comment != '' as has_comment,
+    created_at,
+    to_char(created_at, 'MM/DD/YYYY HH12:MI AM') as created_at_str,
+    CASE severity
+        WHEN 'severe' THEN '🚨'
+        WHEN 'moderate' THEN '⚠️'
+        WHEN 'minor' THEN '⚡'
+        ELSE ''
+    END as severity_emoji,
+    INITCAP(sentiment) as sentiment_label,
+    NULLIF(INITCAP(REPLACE(array_to_string(array_remove(issues, 'none'), ', '), '_', ' ')), '') as issues_str
+FROM feedback;
+
+COMMENT ON VIEW feedback_display IS 'Feedback rows with display-ready date, severity emoji, sentiment label and issues string';
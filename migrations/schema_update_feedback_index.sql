@@ -0,0 +1,6 @@
+-- Index recent-feedback ordering
+-- The Analytics "Recent Feedback" list orders feedback by created_at DESC with a LIMIT;
+-- this lets Postgres read the newest rows from the index instead of sorting the table.
+-- (On a large live table, run it as CREATE INDEX CONCURRENTLY outside a transaction.)
+
+CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback(created_at DESC);
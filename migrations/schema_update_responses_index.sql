@@ -0,0 +1,7 @@
+-- Index the responses list view ordering
+-- The Data Management list orders responses by created_at DESC with a LIMIT;
+-- this lets Postgres read the newest rows from the index instead of sorting the table.
+-- (avg_rating / feedback_count / comments_count are aggregates over feedback, so they
+-- cannot be INCLUDEd; feedback rows are reached through idx_feedback_response_id.)
+
+CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses(created_at DESC, id DESC);
@@ -0,0 +1,196 @@
+"""
+Shared TTL cache for hot read-only queries (Analytics and Source Content pages),
+plus the process-wide answer cache used by RAGSystem.query().
+
+Results are kept in process memory for ``ttl`` seconds. When REDIS_URL is set and
+the optional ``redis`` package is installed, results are also stored in Redis so
+every replica of the app reuses one query result instead of each hitting the
+database. Without Redis this behaves like a plain in-process TTL cache.
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+KEY_PREFIX = "fedrag:cache:"
+
+_local: Dict[str, Tuple[float, Any]] = {}
+_local_lock = threading.Lock()
+
+_redis_client = None
+_redis_checked = False
+
+
+def get_redis():
+    """Return the shared Redis client, or None if Redis is not configured or unreachable."""
+    global _redis_client, _redis_checked
+    if _redis_checked:
+        return _redis_client
+
+    _redis_checked = True
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+    if not REDIS_AVAILABLE:
+        print("Warning: REDIS_URL is set but the redis package is not installed; using in-process cache only")
+        return None
+
+    try:
+        client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        client.ping()
+        _redis_client = client
+    except Exception as e:
+        print(f"Warning: Could not connect to Redis, using in-process cache only: {e}")
+    return _redis_client
+
+
+def ttl_cache(namespace: str, ttl: int = 30) -> Callable:
+    """
+    Cache a function's result for ``ttl`` seconds, keyed on its arguments.
+
+    The wrapped function gains a ``clear()`` method that drops every cached
+    result in its namespace (locally and in Redis).
+
+    Args:
+        namespace: Cache key namespace, e.g. 'analytics'
+        ttl: Seconds a result stays valid
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = f"{KEY_PREFIX}{namespace}:{args!r}:{sorted(kwargs.items())!r}"
+            now = time.monotonic()
+
+            with _local_lock:
+                entry = _local.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+            client = get_redis()
+            if client is not None:
+                try:
+                    cached = client.get(key)
+                    if cached is not None:
+                        value = pickle.loads(cached)
+                        with _local_lock:
+                            _local[key] = (now + ttl, value)
+                        return value
+                except Exception as e:
+                    print(f"Warning: Redis read failed for {namespace}: {e}")
+
+            value = func(*args, **kwargs)
+
+            with _local_lock:
+                _local[key] = (now + ttl, value)
+            if client is not None:
+                try:
+                    client.setex(key, ttl, pickle.dumps(value))
+                except Exception as e:
+                    print(f"Warning: Redis write failed for {namespace}: {e}")
+            return value
+
+        wrapper.clear = lambda: invalidate(namespace)
+        return wrapper
+
+    return decorator
+
+
+def invalidate(namespace: Optional[str] = None) -> None:
+    """
+    Drop cached results for one namespace, or everything (including the answer
+    cache) when namespace is None.
+
+    Other replicas keep their in-process copy until its TTL expires; the
+    shared Redis entry is removed immediately.
+    """
+    prefix = KEY_PREFIX + (f"{namespace}:" if namespace else "")
+    if namespace is None:
+        answer_cache.clear()
+
+    with _local_lock:
+        for key in [k for k in _local if k.startswith(prefix)]:
+            del _local[key]
+
+    client = get_redis()
+    if client is not None:
+        try:
+            keys = list(client.scan_iter(match=prefix + "*"))
+            if keys:
+                client.delete(*keys)
+        except Exception as e:
+            print(f"Warning: Redis invalidation failed for {namespace or 'all'}: {e}")
+
+
+class AnswerCache:
+    """
+    Generated answers keyed on the PII-redacted question.
+
+    Only what Claude produced is cached (category, response text, retrieved
+    documents); RAGSystem.query() still records a new query and response row on
+    every hit, so analytics count repeats and feedback always targets a live
+    response. Lookups match the normalized text exactly, then fall back to the
+    nearest cached question embedding above ``threshold`` (cosine similarity).
+    ``scope`` separates answers generated with different settings (top_k, max_tokens).
+    """
+
+    def __init__(self, ttl: int = 3600, max_entries: int = 512, threshold: float = 0.97):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        return embedding / (np.linalg.norm(embedding) or 1.0)
+
+    def lookup(self, scope: str, key: str, embedding: np.ndarray) -> Optional[Dict]:
+        """Return the cached answer for this question (or a near-identical one), if any."""
+        now = time.monotonic()
+        key = f"{scope}\x00{key}"
+        with self._lock:
+            for stale in [k for k, (expires, _, _) in self._entries.items() if expires <= now]:
+                del self._entries[stale]
+
+            if key not in self._entries:
+                keys = [k for k in self._entries if k.startswith(f"{scope}\x00")]
+                if not keys:
+                    return None
+                similarities = np.stack([self._entries[k][1] for k in keys]) @ self._unit(embedding)
+                best = int(np.argmax(similarities))
+                if similarities[best] <= self.threshold:
+                    return None
+                key = keys[best]
+
+            self._entries.move_to_end(key)  # Mark as most recently used
+            return self._entries[key][2]
+
+    def store(self, scope: str, key: str, embedding: np.ndarray, answer: Dict) -> None:
+        """Cache an answer, evicting the least recently used entry when full."""
+        key = f"{scope}\x00{key}"
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, self._unit(embedding), answer)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every cached answer (e.g. after responses are deleted)."""
+        with self._lock:
+            self._entries.clear()
+
+
+answer_cache = AnswerCache()
@@ -2,11 +2,13 @@
 Main RAG System implementation with Claude Sonnet 4 integration.
 """
 import os
+import traceback
 from typing import List, Dict, Optional, Any
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
-from database import Database
+from database import Database, schedule_analytics_refresh
+from query_cache import answer_cache
 from embeddings import get_embedding_service
 from feedback_analyzer import FeedbackAnalyzer
 from pii_redactor import get_pii_redactor
@@ -106,14 +108,29 @@ class RAGSystem:
         else:
             print(f"Processing query: {query_text}")
 
-        # Detect query category (using redacted query)
-        category = self._detect_category(query_text)
-        print(f"Query category: {category}")
-
-        # Generate query embedding (using redacted query)
+        # Generate query embedding (using redacted query); it is also the answer cache's lookup key
         query_embedding = self.embeddings.embed_query(query_text)
 
-        # Store query in database with redaction tracking
+        # Reuse a recent answer to the same (or a near-identical) redacted question
+        cache_scope = f"{top_k}:{max_tokens}"
+        cache_key = query_text.strip().lower()
+        cached = answer_cache.lookup(cache_scope, cache_key, query_embedding)
+
+        if cached:
+            # A content refresh replaces the document rows; never reuse an answer whose sources are gone
+            with self.db as db:
+                if not db.documents_exist([doc['id'] for doc in cached['retrieved_documents']]):
+                    cached = None
+
+        if cached:
+            category = cached['category']
+            print(f"Query category: {category} (cached answer)")
+        else:
+            # Detect query category (using redacted query)
+            category = self._detect_category(query_text)
+            print(f"Query category: {category}")
+
+        # Store query in database with redaction tracking (on cache hits too, so repeats are counted)
         # IMPORTANT: Only redacted query is stored. Original is NEVER stored.
         # Redaction details do NOT include actual PII values.
         with self.db as db:
@@ -126,18 +143,30 @@ class RAGSystem:
                 redaction_details=self.pii_redactor.get_safe_redaction_details(redaction_result) if redaction_result else None
             )
 
-            # Search for similar documents
-            similar_docs = db.search_similar_documents(query_embedding, top_k=top_k)
+            if cached:
+                similar_docs = cached['retrieved_documents']
+            else:
+                # Search for similar documents
+                similar_docs = db.search_similar_documents(query_embedding, top_k=top_k)
 
-        print(f"Retrieved {len(similar_docs)} relevant documents")
+        if cached:
+            response_text = cached['text']
+        else:
+            print(f"Retrieved {len(similar_docs)} relevant documents")
+
+            # Build context from retrieved documents
+            context = self._build_context(similar_docs)
 
-        # Build context from retrieved documents
-        context = self._build_context(similar_docs)
+            # Generate response with Claude
+            response_text = self._generate_response(query_text, context, max_tokens)
 
-        # Generate response with Claude
-        response_text = self._generate_response(query_text, context, max_tokens)
+            answer_cache.store(cache_scope, cache_key, query_embedding, {
+                'category': category,
+                'text': response_text,
+                'retrieved_documents': similar_docs,
+            })
 
-        # Store response
+        # Store response (a new row per ask, so feedback always targets an existing response)
         retrieved_doc_ids = [doc['id'] for doc in similar_docs]
         with self.db as db:
             response_id = db.add_response(
@@ -147,6 +176,9 @@ class RAGSystem:
                 model_version=self.model
             )
 
+        # Fold the new query into the analytics dashboard views (debounced)
+        schedule_analytics_refresh()
+
         return {
             'id': response_id,
             'text': response_text,
@@ -294,32 +326,7 @@ Please provide a professional, well-structured response with inline citations li
         Returns:
             Feedback ID.
         """
-        analysis = None
-
-        # Analyze comment if provided and analysis is enabled
-        if comment and analyze_comment:
-            try:
-                # Get response and query text for context
-                with self.db as db:
-                    response_data = db.get_response(response_id)
-
-                if response_data:
-                    print("Analyzing feedback comment...")
-                    analysis = self.feedback_analyzer.analyze_comment(
-                        comment=comment,
-                        rating=rating,
-                        query_text=response_data['query_text'],
-                        response_text=response_data['response_text']
-                    )
-                    # Support both old and new format
-                    sentiment_display = analysis.get('sentiment') or f"{analysis.get('sentiment_score', 0):.2f}"
-                    issues = analysis.get('issues') or analysis.get('issue_types', [])
-                    print(f"  Sentiment: {sentiment_display}, "
-                          f"Severity: {analysis['severity']}, "
-                          f"Issues: {', '.join(issues[:3]) if issues else 'none'}")
-            except Exception as e:
-                print(f"Warning: Comment analysis failed: {e}")
-                analysis = None
+        analysis = self.analyze_feedback(response_id, rating, comment) if analyze_comment else None
 
         # Store feedback with analysis
         with self.db as db:
@@ -335,15 +342,104 @@ Please provide a professional, well-structured response with inline citations li
             print(f"✅ URL-level scores updated: {updated_count} URLs")
         except Exception as e:
             print(f"❌ Failed to update URL scores: {e}")
-            import traceback
             traceback.print_exc()
 
+        # Fold the new feedback into the analytics dashboard views (debounced)
+        schedule_analytics_refresh()
+
         # Check if document should be flagged for review
         if analysis and analysis.get('needs_review'):
             self._check_document_review_flags(response_id)
 
         return feedback_id
 
+    def submit_feedback_batch(self, items: List[Dict], analyze_comment: bool = True) -> List[int]:
+        """
+        Submit several ratings at once (e.g. queued on the Review page).
+
+        Comments are analyzed one by one as in submit_feedback (unless an item
+        already carries its 'analysis'), but the rows are stored with a single
+        INSERT and URL-level scores are recalculated once.
+
+        Args:
+            items: Dicts with response_id, rating, optional comment and optional
+                precomputed analysis (from analyze_feedback).
+            analyze_comment: Whether to analyze comments with AI (default True).
+
+        Returns:
+            Feedback IDs, in the same order as items.
+        """
+        if not items:
+            return []
+
+        rows = []
+        for item in items:
+            comment = item.get('comment') or None
+            if 'analysis' in item:
+                analysis = item['analysis']
+            else:
+                analysis = self.analyze_feedback(item['response_id'], item['rating'], comment) if analyze_comment else None
+            rows.append((item['response_id'], item['rating'], comment, analysis))
+
+        with self.db as db:
+            feedback_ids = db.add_feedback_batch(rows)
+
+        print(f"Feedback submitted: {len(feedback_ids)} ratings")
+
+        try:
+            print("Recalculating URL-level scores...")
+            with self.db as db:
+                updated_count = db.calculate_source_document_scores(use_enhanced_scores=True)
+            print(f"✅ URL-level scores updated: {updated_count} URLs")
+        except Exception as e:
+            print(f"❌ Failed to update URL scores: {e}")
+            traceback.print_exc()
+
+        schedule_analytics_refresh()
+
+        for response_id, _, _, analysis in rows:
+            if analysis and analysis.get('needs_review'):
+                self._check_document_review_flags(response_id)
+
+        return feedback_ids
+
+    def analyze_feedback(self, response_id: int, rating: int, comment: Optional[str]) -> Optional[Dict]:
+        """
+        Analyze a feedback comment with the response and query as context.
+
+        Safe to call from a background thread (e.g. while a rating is queued); pass
+        the result to submit_feedback_batch() as the item's 'analysis'.
+        """
+        if not comment:
+            return None
+
+        analysis = None
+        try:
+            # Get response and query text for context (own pooled connection: this may
+            # run on a background thread alongside other uses of self.db)
+            with Database() as db:
+                response_data = db.get_response(response_id)
+
+            if response_data:
+                print("Analyzing feedback comment...")
+                analysis = self.feedback_analyzer.analyze_comment(
+                    comment=comment,
+                    rating=rating,
+                    query_text=response_data['query_text'],
+                    response_text=response_data['response_text']
+                )
+                # Support both old and new format
+                sentiment_display = analysis.get('sentiment') or f"{analysis.get('sentiment_score', 0):.2f}"
+                issues = analysis.get('issues') or analysis.get('issue_types', [])
+                print(f"  Sentiment: {sentiment_display}, "
+                      f"Severity: {analysis['severity']}, "
+                      f"Issues: {', '.join(issues[:3]) if issues else 'none'}")
+        except Exception as e:
+            print(f"Warning: Comment analysis failed: {e}")
+            analysis = None
+
+        return analysis
+
     def _check_document_review_flags(self, response_id: int) -> None:
         """Check if documents from this response should be flagged for review."""
         try:
@@ -352,26 +448,30 @@ Please provide a professional, well-structured response with inline citations li
                 if not response_data or not response_data.get('retrieved_doc_ids'):
                     return
 
+                # Popular documents can have thousands of analyzed feedback rows, and only
+                # two columns are used: read them as plain tuples rather than dict rows
+                feedback_cursor = db.new_cursor()
+
                 # Get feedback for each document used in the response
                 for doc_id in response_data['retrieved_doc_ids']:
                     # Get all feedback for responses that used this document
-                    db.cursor.execute("""
-                        SELECT f.*, r.retrieved_doc_ids
+                    feedback_cursor.execute("""
+                        SELECT f.issues, f.severity
                         FROM feedback f
                         JOIN responses r ON f.response_id = r.id
                         WHERE %s = ANY(r.retrieved_doc_ids)
                         AND f.summary IS NOT NULL;
                     """, (doc_id,))
-                    feedbacks = db.cursor.fetchall()
+                    feedbacks = feedback_cursor.fetchall()
 
                     if feedbacks:
-                        # Analyze patterns (support both old and new column names)
+                        # Analyze patterns
                         patterns = self.feedback_analyzer.analyze_document_feedback_patterns(
                             [{'analysis': {
-                                'issue_types': fb.get('issues') or fb.get('issue_types', []),
-                                'needs_review': fb.get('severity') in ['severe', 'moderate'],
-                                'severity': fb.get('severity', 'none')
-                            }} for fb in feedbacks]
+                                'issue_types': issues or [],
+                                'needs_review': severity in ['severe', 'moderate'],
+                                'severity': severity
+                            }} for issues, severity in feedbacks]
                         )
 
                         # Flag if needed
@@ -384,6 +484,8 @@ Please provide a professional, well-structured response with inline citations li
                                 total_feedbacks=patterns['total_feedbacks']
                             )
                             print(f"  ⚠️  Document {doc_id} flagged for review: {patterns['review_reason']}")
+
+                feedback_cursor.close()
         except Exception as e:
             print(f"Warning: Could not check review flags: {e}")
 
@@ -17,7 +17,8 @@ CREATE TABLE IF NOT EXISTS documents (
     source_title TEXT,
     last_refreshed TIMESTAMP,
     is_external_source BOOLEAN DEFAULT FALSE,
-    is_flagged BOOLEAN DEFAULT FALSE
+    is_flagged BOOLEAN DEFAULT FALSE,
+    preview TEXT GENERATED ALWAYS AS (LEFT(content, 200)) STORED  -- Snippet for source listings
 );
 
 -- Queries table
@@ -118,9 +119,11 @@ CREATE TABLE IF NOT EXISTS document_review_flags (
 CREATE INDEX IF NOT EXISTS idx_documents_embedding ON documents USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_queries_embedding ON queries USING ivfflat (query_embedding vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_responses_query_id ON responses(query_id);
+CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses(created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_feedback_response_id ON feedback(response_id);
 CREATE INDEX IF NOT EXISTS idx_feedback_query_id ON feedback(query_id);
 CREATE INDEX IF NOT EXISTS idx_feedback_document_id ON feedback(document_id);
+CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_document_scores_document_id ON document_scores(document_id);
 CREATE INDEX IF NOT EXISTS idx_source_document_scores_url ON source_document_scores(source_url);
 CREATE INDEX IF NOT EXISTS idx_source_document_scores_type ON source_document_scores(source_type);
@@ -136,6 +139,77 @@ CREATE INDEX IF NOT EXISTS idx_document_review_status ON document_review_flags(s
 CREATE INDEX IF NOT EXISTS idx_document_review_document_id ON document_review_flags(document_id);
 CREATE INDEX IF NOT EXISTS idx_documents_flagged ON documents(is_flagged) WHERE is_flagged = TRUE;
 
+-- Analytics dashboard materialized views (refreshed by the app after writes)
+
+-- Rating distribution (1-5 stars)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_rating_distribution AS
+SELECT rating, COUNT(*) as count
+FROM feedback
+GROUP BY rating;
+
+-- Queries per day (most recent 30 days with activity)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_query_timeline_30d AS
+SELECT DATE(created_at) as date, COUNT(*) as count
+FROM queries
+GROUP BY DATE(created_at)
+ORDER BY date DESC
+LIMIT 30;
+
+-- Query category breakdown
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_category_breakdown AS
+SELECT category, COUNT(*) as count
+FROM queries
+WHERE category IS NOT NULL
+GROUP BY category;
+
+-- Most common feedback issues (top 8)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_issue_distribution AS
+SELECT issue, COUNT(*) as count
+FROM feedback
+CROSS JOIN UNNEST(issues) as issue
+WHERE issues IS NOT NULL
+  AND array_length(issues, 1) > 0
+  AND issue != 'none'
+GROUP BY issue
+ORDER BY count DESC
+LIMIT 8;
+
+-- Feedback severity distribution
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_severity_distribution AS
+SELECT severity, COUNT(*) as count
+FROM feedback
+WHERE severity IS NOT NULL AND severity != 'none'
+GROUP BY severity;
+
+-- Unique indexes are required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_rating_distribution ON mv_rating_distribution(rating);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_query_timeline_30d ON mv_query_timeline_30d(date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_category_breakdown ON mv_category_breakdown(category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_issue_distribution ON mv_issue_distribution(issue);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_severity_distribution ON mv_severity_distribution(severity);
+
+-- Feedback display view (Data Management response dialog)
+CREATE OR REPLACE VIEW feedback_display AS
+SELECT
+    id,
+    response_id,
+    rating,
+    COALESCE(comment, '') as comment,
+    comment IS NOT NULL AND comment != '' as has_comment,
+    created_at,
+    to_char(created_at, 'MM/DD/YYYY HH12:MI AM') as created_at_str,
+    CASE severity
+        WHEN 'severe' THEN '🚨'
+        WHEN 'moderate' THEN '⚠️'
+        WHEN 'minor' THEN '⚡'
+        ELSE ''
+    END as severity_emoji,
+    INITCAP(sentiment) as sentiment_label,
+    NULLIF(INITCAP(REPLACE(array_to_string(array_remove(issues, 'none'), ', '), '_', ' ')), '') as issues_str
+FROM feedback;
+
+COMMENT ON VIEW feedback_display IS 'Feedback rows with display-ready date, severity emoji, sentiment label and issues string';
+
 -- Add constraint for PII tracking
 DO $$
 BEGIN
@@ -162,3 +236,8 @@ COMMENT ON CONSTRAINT queries_pii_tracking_check ON queries IS 'Ensures PII trac
 COMMENT ON COLUMN feedback.enhanced_feedback_score IS 'Enhanced score combining rating and sentiment analysis';
 COMMENT ON TABLE document_review_flags IS 'Tracks documents flagged for review based on feedback patterns';
 COMMENT ON TABLE source_document_scores IS 'URL-level scores that persist across data refreshes - applied to all chunks from same source URL';
+COMMENT ON MATERIALIZED VIEW mv_rating_distribution IS 'Analytics dashboard: feedback count per rating (refreshed by the app)';
+COMMENT ON MATERIALIZED VIEW mv_query_timeline_30d IS 'Analytics dashboard: queries per day for the 30 most recent active days';
+COMMENT ON MATERIALIZED VIEW mv_category_breakdown IS 'Analytics dashboard: query count per category';
+COMMENT ON MATERIALIZED VIEW mv_issue_distribution IS 'Analytics dashboard: top 8 issue types from feedback analysis';
+COMMENT ON MATERIALIZED VIEW mv_severity_distribution IS 'Analytics dashboard: feedback count per severity';
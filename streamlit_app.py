@@ -3,23 +3,23 @@ Streamlit interface for RAG System
 Provides query interface, feedback collection, and analytics dashboard
 """
 import streamlit as st
-import os
+import time
 from datetime import datetime
 from dotenv import load_dotenv
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from rag_system import RAGSystem
-from database import Database
-import subprocess
+from database import Database, fetch_analytics_views
+from query_cache import ttl_cache, invalidate, answer_cache
+import traceback
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from st_copy import copy_button
+from typing import Callable, Dict
 
 # Load environment variables
 load_dotenv()
 
+# Errors shown in the UI are also logged with their stack trace for the deployment logs
+logger = logging.getLogger(__name__)
+
 # Page configuration
 st.set_page_config(
     page_title="Federal Reserve Correspondence System",
@@ -28,58 +28,42 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Database connection helper
-def get_db_connection():
-    """Get a new database connection using DATABASE_MODE switcher."""
-    from urllib.parse import urlparse
-
-    db_mode = os.getenv('DATABASE_MODE', 'local').lower()
-
-    if db_mode == 'supabase':
-        # Use Supabase
-        supabase_url = os.getenv('SUPABASE_URL')
-        if not supabase_url:
-            raise ValueError("SUPABASE_URL not set in .env file")
-
-        # Parse the Supabase URL
-        parsed = urlparse(supabase_url)
-        return psycopg2.connect(
-            host=parsed.hostname,
-            port=parsed.port,
-            database=parsed.path[1:],  # Remove leading '/'
-            user=parsed.username,
-            password=parsed.password
-        )
-    else:
-        # Use local PostgreSQL (default)
-        return psycopg2.connect(
-            host=os.getenv('LOCAL_DB_HOST', 'localhost'),
-            port=os.getenv('LOCAL_DB_PORT', '5433'),
-            database=os.getenv('LOCAL_DB_NAME', 'rag_system'),
-            user=os.getenv('LOCAL_DB_USER', 'rag_user'),
-            password=os.getenv('LOCAL_DB_PASSWORD', '')
-        )
-
 # Initialize RAG system
 @st.cache_resource
 def get_rag_system():
     """Initialize RAG system."""
+    # Imported here so pages that never query (Analytics, Data Management, ...) skip
+    # loading the embedding model, Anthropic client and PII redactor.
+    from rag_system import RAGSystem
+
     return RAGSystem()
 
+@st.cache_resource
+def get_event_loop():
+    """Start one background event loop for async work (content crawls) and reuse it."""
+    import asyncio
+    import threading
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="async-loop", daemon=True).start()
+    return loop
+
 # Generate diagrams helper
+DIAGRAM_FILES = (
+    'images/rag_architecture.png',
+    'images/rag_query_flow.png',
+    'images/rag_content_pipeline.png'
+)
+
 def ensure_diagrams_exist():
     """Generate pipeline diagrams if they don't exist."""
-    diagram_files = [
-        'images/rag_architecture.png',
-        'images/rag_query_flow.png',
-        'images/rag_content_pipeline.png'
-    ]
-
     # Check if any diagrams are missing
-    missing = [f for f in diagram_files if not Path(f).exists()]
+    missing = [f for f in DIAGRAM_FILES if not Path(f).exists()]
 
     if missing:
         try:
+            import subprocess
+
             # Run the diagram generation script
             subprocess.run(['python3', 'generate_pipeline_diagram.py'],
                          check=True,
@@ -91,8 +75,9 @@ def ensure_diagrams_exist():
             return False
     return True
 
-# Custom CSS
-st.markdown("""
+# Custom CSS - emitted on every run on purpose: Streamlit removes elements that are
+# not rendered again during a rerun, so a "CSS already injected" guard would drop the styles
+CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -120,7 +105,8 @@ st.markdown("""
         margin: 0.5rem 0;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 def query_page():
     """Main query and response interface."""
@@ -131,6 +117,14 @@ def query_page():
     Responses are generated based on official Federal Reserve sources and documentation.
     """)
 
+    # Warm the RAG system on the landing page so the first Submit click hits the cache.
+    # Failures are left to the submit handler, which calls get_rag_system() again and reports errors.
+    try:
+        with st.spinner("Initializing RAG system..."):
+            get_rag_system()
+    except Exception:
+        pass
+
     # Initialize session state for question
     if 'question_input' not in st.session_state:
         st.session_state.question_input = ""
@@ -156,8 +150,7 @@ def query_page():
 
         with st.spinner("Generating response..."):
             try:
-                rag = get_rag_system()
-                response = rag.query(query, top_k=top_k, max_tokens=max_tokens)
+                response = get_rag_system().query(query, top_k=top_k, max_tokens=max_tokens)
 
                 # Store complete response data in session state
                 st.session_state.current_response = {
@@ -174,6 +167,7 @@ def query_page():
                 }
 
             except Exception as e:
+                logger.exception("Error generating response")
                 st.error(f"Error generating response: {e}")
                 return
 
@@ -204,6 +198,7 @@ def query_page():
         with col1:
             st.markdown("**📝 Response**")
         with col2:
+            from st_copy import copy_button
             copy_button(response['text'], key=f"copy_{response['id']}")
 
         # Display the response in a clean container
@@ -267,6 +262,7 @@ def query_page():
                     )
 
                 st.success(f"✅ Thank you for your feedback! (ID: {feedback_id})")
+                _invalidate_read_caches()
 
                 # Clear the response after successful feedback
                 del st.session_state.current_response
@@ -274,24 +270,15 @@ def query_page():
 
             except Exception as e:
                 st.error(f"Error submitting feedback: {e}")
-                import traceback
+                logger.exception("Error submitting feedback")
                 st.code(traceback.format_exc())
 
-def review_page():
-    """Review and rate unrated responses."""
-    st.markdown('<div class="main-header">📝 Review Unrated Responses</div>', unsafe_allow_html=True)
-
-    st.markdown("""
-    Review previous responses that haven't been rated yet.
-    Your feedback helps improve the system!
-    """)
-
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get unrated responses
-        cursor.execute("""
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_unrated_responses():
+    """Fetch the 50 most recent responses that have no feedback yet."""
+    db = Database()
+    with db:
+        db.cursor.execute("""
             SELECT
                 r.id as response_id,
                 q.query_text,
@@ -302,13 +289,119 @@ def review_page():
             JOIN queries q ON r.query_id = q.id
             LEFT JOIN feedback f ON r.id = f.response_id
             WHERE f.id IS NULL
-            ORDER BY r.created_at DESC
+            ORDER BY r.created_at DESC, r.id DESC
             LIMIT 50
         """)
+        return [dict(row) for row in db.cursor.fetchall()]
+
+def _invalidate_read_caches():
+    """Drop cached reads that depend on responses/feedback after a write."""
+    _fetch_unrated_responses.clear()
+    fetch_analytics_data.clear()
+    _fetch_data_counts.clear()
+
+def _invalidate_deleted_responses():
+    """After responses are deleted: drop cached reads and stop reusing cached answers."""
+    _invalidate_read_caches()
+    answer_cache.clear()
+
+# Review page ratings are queued and stored together: once this many are pending,
+# every REVIEW_AUTOSAVE_SECONDS, or when the user saves them or leaves the page
+REVIEW_BATCH_SIZE = 10
+REVIEW_AUTOSAVE_SECONDS = 15
+
+@st.cache_resource
+def get_analysis_executor():
+    """Thread pool that analyzes queued feedback comments while the reviewer moves on."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="feedback-analysis")
+
+def _queue_feedback(response_id, rating, comment):
+    """Queue a Review page rating; its comment is analyzed in the background right away."""
+    item = {'response_id': response_id, 'rating': rating, 'comment': comment}
+    if comment:
+        item['analysis_future'] = get_analysis_executor().submit(
+            get_rag_system().analyze_feedback, response_id, rating, comment
+        )
+    st.session_state.setdefault('pending_feedback', []).append(item)
+
+def _flush_pending_feedback(wait=True):
+    """Store queued Review page ratings with one batch insert; returns how many were saved.
+
+    With wait=False only ratings whose comment analysis has finished are stored.
+    """
+    pending = st.session_state.get('pending_feedback')
+    if not pending:
+        return 0
+
+    ready = [item for item in pending
+             if wait or 'analysis_future' not in item or item['analysis_future'].done()]
+    if not ready:
+        return 0
+
+    batch = [
+        {
+            'response_id': item['response_id'],
+            'rating': item['rating'],
+            'comment': item['comment'],
+            'analysis': item['analysis_future'].result() if 'analysis_future' in item else None,
+        }
+        for item in ready
+    ]
+    get_rag_system().submit_feedback_batch(batch)
+    saved_ids = {id(item) for item in ready}
+    st.session_state.pending_feedback = [item for item in pending if id(item) not in saved_ids]
+    _invalidate_read_caches()
+    return len(batch)
+
+@st.fragment(run_every=f"{REVIEW_AUTOSAVE_SECONDS}s")
+def _autosave_pending_feedback():
+    """Periodically store queued Review page ratings so a closed tab loses at most a few seconds."""
+    if not st.session_state.get('pending_feedback'):
+        return
+    try:
+        saved = _flush_pending_feedback(wait=False)
+        if saved:
+            st.toast(f"✅ {saved} queued rating(s) saved")
+    except Exception as e:
+        logger.exception("Error saving queued ratings")
+        # st.sidebar can't be written from inside a fragment
+        st.error(f"Error saving queued ratings: {e}")
+
+@st.fragment
+def review_page():
+    """Review and rate unrated responses.
+
+    Runs as a fragment: rating and paging buttons rerun only this page, not the sidebar.
+    """
+    st.markdown('<div class="main-header">📝 Review Unrated Responses</div>', unsafe_allow_html=True)
+
+    st.markdown("""
+    Review previous responses that haven't been rated yet.
+    Your feedback helps improve the system!
+    """)
+
+    try:
+        pending = st.session_state.setdefault('pending_feedback', [])
+
+        if pending:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.info(f"📥 {len(pending)} rating(s) queued - saved automatically within {REVIEW_AUTOSAVE_SECONDS} seconds")
+            with col2:
+                if st.button(f"📤 Save {len(pending)} now", use_container_width=True):
+                    try:
+                        with st.spinner("Submitting feedback..."):
+                            saved = _flush_pending_feedback()
+                        st.toast(f"✅ {saved} ratings saved")
+                        st.rerun(scope="fragment")
+                    except Exception as e:
+                        st.error(f"Error submitting feedback: {e}")
+                        logger.exception("Error submitting feedback")
+                        st.code(traceback.format_exc())
 
-        unrated_responses = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        # Queued ratings are not stored yet, so hide those responses here
+        queued_ids = {item['response_id'] for item in pending}
+        unrated_responses = [r for r in _fetch_unrated_responses() if r['response_id'] not in queued_ids]
 
         if not unrated_responses:
             st.info("🎉 All responses have been rated! Great job!")
@@ -366,45 +459,41 @@ def review_page():
         with col1:
             if st.button("⬅️ Previous", disabled=(current_page == 0)):
                 st.session_state.review_page = max(0, current_page - 1)
-                st.rerun()
+                st.rerun(scope="fragment")
 
         with col2:
             if st.button("➡️ Next", disabled=(current_page >= len(unrated_responses) - 1)):
                 st.session_state.review_page = min(len(unrated_responses) - 1, current_page + 1)
-                st.rerun()
+                st.rerun(scope="fragment")
 
         with col3:
             if st.button("⏭️ Skip"):
                 st.session_state.review_page = min(len(unrated_responses) - 1, current_page + 1)
-                st.rerun()
+                st.rerun(scope="fragment")
 
         with col4:
             if st.button("✅ Submit Rating", type="primary"):
                 try:
-                    # Use RAG system to submit feedback with AI analysis
-                    with st.spinner("Submitting feedback..."):
-                        rag = get_rag_system()
-                        feedback_id = rag.submit_feedback(
-                            response_id=response['response_id'],
-                            rating=rating,
-                            comment=comment if comment else None,
-                            analyze_comment=True  # Enable AI analysis
-                        )
-
-                    st.success(f"✅ Feedback submitted! (ID: {feedback_id})")
-                    # Move to next response
-                    if current_page < len(unrated_responses) - 1:
-                        st.session_state.review_page = current_page + 1
-                    st.rerun()
+                    # Queue the rating; the queue is stored in one batch (comments are
+                    # analyzed in the background meanwhile)
+                    _queue_feedback(response['response_id'], rating, comment if comment else None)
+                    if len(st.session_state.pending_feedback) >= REVIEW_BATCH_SIZE:
+                        with st.spinner("Submitting feedback..."):
+                            _flush_pending_feedback()
+                    # The queued response drops out of the list, so the same index shows the next one.
+                    # The first queued rating reruns the whole app so main() mounts the autosave timer.
+                    if len(st.session_state.pending_feedback) == 1:
+                        st.rerun()
+                    st.rerun(scope="fragment")
 
                 except Exception as e:
                     st.error(f"Error submitting feedback: {e}")
-                    import traceback
+                    logger.exception("Error submitting feedback")
                     st.code(traceback.format_exc())
 
     except Exception as e:
         st.error(f"Error loading unrated responses: {e}")
-        import traceback
+        logger.exception("Error loading unrated responses")
         st.code(traceback.format_exc())
 
 @st.dialog("Feedback Details", width="large")
@@ -443,39 +532,162 @@ def show_feedback_dialog(fb):
     st.markdown("**Response:**")
     st.markdown(fb['response_text'])
 
+@st.cache_resource
+def get_query_executor():
+    """Thread pool for running independent dashboard reads side by side on pooled connections."""
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix="db-read")
+
+def _fetch_analytics_counts():
+    """Headline and feedback-insight counts for the Analytics dashboard."""
+    data = {}
+    with Database() as db:
+        chart_cursor = db.new_cursor()
+
+        # All headline counts in one round trip; feedback is scanned once for its four figures
+        chart_cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM queries),
+                (SELECT COUNT(*) FROM responses),
+                fb.avg_rating,
+                fb.total,
+                fb.analyzed,
+                fb.needs_review,
+                (SELECT COUNT(*) FROM document_review_flags WHERE status = 'pending')
+            FROM (
+                SELECT
+                    AVG(rating)::float as avg_rating,
+                    COUNT(*) as total,
+                    COUNT(*) FILTER (WHERE summary IS NOT NULL) as analyzed,
+                    COUNT(*) FILTER (WHERE severity IN ('severe', 'moderate')) as needs_review
+                FROM feedback
+            ) fb
+        """)
+        (data['total_queries'], data['total_responses'], avg_rating, data['total_feedback'],
+         data['analyzed_count'], data['needs_review_count'], data['docs_flagged']) = chart_cursor.fetchone()
+        data['avg_rating'] = avg_rating or 0
+
+        chart_cursor.close()
+    return data
+
+def _fetch_analytics_charts():
+    """Chart breakdowns for the Analytics dashboard."""
+    data = {}
+    with Database() as db:
+        chart_cursor = db.new_cursor()
+
+        # Every chart breakdown is read from its analytics view in one round trip
+        (data['rating_data'], data['query_timeline'], data['category_data'],
+         data['issue_data'], data['severity_data']) = fetch_analytics_views(chart_cursor, [
+            ('mv_rating_distribution', 'ORDER BY rating'),
+            ('mv_query_timeline_30d', 'ORDER BY date'),
+            ('mv_category_breakdown', 'ORDER BY count DESC'),
+            ('mv_issue_distribution', 'ORDER BY count DESC'),
+            ('mv_severity_distribution', """
+                ORDER BY
+                    CASE severity
+                        WHEN 'severe' THEN 1
+                        WHEN 'moderate' THEN 2
+                        WHEN 'minor' THEN 3
+                        ELSE 4
+                    END
+            """),
+        ])
+
+        chart_cursor.close()
+    return data
+
+def _fetch_analytics_lists():
+    """Flagged documents, recent feedback and top queries for the Analytics dashboard."""
+    data = {}
+    with Database() as db:
+        # All three lists in one round trip
+        data['flagged_docs'], data['recent_feedback'], top_queries = db.fetch_batch([
+            """
+                SELECT
+                    drf.document_id,
+                    drf.reason,
+                    drf.total_feedbacks,
+                    to_char(drf.flagged_at, 'MM/DD/YYYY HH12:MI AM') as flagged_ts,
+                    LEFT(d.content, 300) as content_preview,
+                    COALESCE(d.metadata->>'source_title', 'Unknown') as source_title,
+                    COALESCE(d.metadata->>'source_url', '') as source_url
+                FROM document_review_flags drf
+                JOIN documents d ON drf.document_id = d.id
+                WHERE drf.status = 'pending'
+                ORDER BY drf.flagged_at DESC
+                LIMIT 5
+            """,
+            """
+                SELECT
+                    f.rating,
+                    f.comment,
+                    f.sentiment,
+                    f.issues,
+                    f.severity,
+                    f.summary,
+                    q.query_text,
+                    r.response_text,
+                    CASE f.severity
+                        WHEN 'minor' THEN '⚡ '
+                        WHEN 'moderate' THEN '⚠️ '
+                        WHEN 'severe' THEN '🚨 '
+                        ELSE ''
+                    END as sev_prefix,
+                    to_char(f.created_at, 'MM/DD/YYYY HH12:MI AM') as ts
+                FROM feedback f
+                JOIN responses r ON f.response_id = r.id
+                JOIN queries q ON r.query_id = q.id
+                ORDER BY f.created_at DESC
+                LIMIT 10
+            """,
+            """
+                SELECT query_text, COUNT(*) as count
+                FROM queries
+                GROUP BY query_text
+                HAVING COUNT(*) > 1
+                ORDER BY count DESC
+                LIMIT 10
+            """,
+        ])
+        data['top_queries'] = [(row['query_text'], row['count']) for row in top_queries]
+    return data
+
+@ttl_cache('analytics', ttl=30)
+def fetch_analytics_data():
+    """Run the Analytics dashboard reads concurrently and return plain Python data.
+
+    The three groups are independent, so each runs on its own pooled connection and
+    the page waits for the slowest round trip rather than the sum of all three.
+    """
+    executor = get_query_executor()
+    futures = [executor.submit(fetch) for fetch in
+               (_fetch_analytics_counts, _fetch_analytics_charts, _fetch_analytics_lists)]
+
+    data = {}
+    for future in futures:
+        data.update(future.result())
+    return data
+
 def analytics_page():
     """Analytics and statistics dashboard."""
+    # Heavy charting deps are only imported when this page is opened
+    import pandas as pd
+    import plotly.express as px
+
     st.markdown('<div class="main-header">📊 Analytics Dashboard</div>', unsafe_allow_html=True)
 
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        data = fetch_analytics_data()
 
         # Overall metrics
         st.markdown("### 📈 Overall Metrics")
 
         col1, col2, col3, col4 = st.columns(4)
 
-        # Total queries
-        cursor.execute("SELECT COUNT(*) as count FROM queries")
-        total_queries = cursor.fetchone()['count']
-        col1.metric("Total Queries", total_queries)
-
-        # Total responses
-        cursor.execute("SELECT COUNT(*) as count FROM responses")
-        total_responses = cursor.fetchone()['count']
-        col2.metric("Total Responses", total_responses)
-
-        # Average rating
-        cursor.execute("SELECT AVG(rating) as avg_rating FROM feedback")
-        avg_rating_result = cursor.fetchone()['avg_rating']
-        avg_rating = float(avg_rating_result) if avg_rating_result else 0
-        col3.metric("Average Rating", f"{avg_rating:.2f} ⭐")
-
-        # Total feedback
-        cursor.execute("SELECT COUNT(*) as count FROM feedback")
-        total_feedback = cursor.fetchone()['count']
-        col4.metric("Total Feedback", total_feedback)
+        col1.metric("Total Queries", data['total_queries'])
+        col2.metric("Total Responses", data['total_responses'])
+        col3.metric("Average Rating", f"{data['avg_rating']:.2f} ⭐")
+        col4.metric("Total Feedback", data['total_feedback'])
 
         st.markdown("---")
 
@@ -485,16 +697,10 @@ def analytics_page():
         # Rating distribution
         with col1:
             st.markdown("### ⭐ Rating Distribution")
-            cursor.execute("""
-                SELECT rating, COUNT(*) as count
-                FROM feedback
-                GROUP BY rating
-                ORDER BY rating
-            """)
-            rating_data = cursor.fetchall()
+            rating_data = data['rating_data']
 
             if rating_data:
-                df_ratings = pd.DataFrame(rating_data)
+                df_ratings = pd.DataFrame.from_records(rating_data, columns=['rating', 'count'])
                 fig = px.bar(
                     df_ratings,
                     x='rating',
@@ -511,18 +717,11 @@ def analytics_page():
         # Queries over time
         with col2:
             st.markdown("### 📅 Queries Over Time")
-            cursor.execute("""
-                SELECT DATE(created_at) as date, COUNT(*) as count
-                FROM queries
-                GROUP BY DATE(created_at)
-                ORDER BY date DESC
-                LIMIT 30
-            """)
-            query_timeline = cursor.fetchall()
+            query_timeline = data['query_timeline']
 
             if query_timeline:
-                df_timeline = pd.DataFrame(query_timeline)
-                df_timeline = df_timeline.sort_values('date')
+                df_timeline = pd.DataFrame.from_records(query_timeline, columns=['date', 'count'])
+                df_timeline['date'] = pd.to_datetime(df_timeline['date'])
                 fig = px.line(
                     df_timeline,
                     x='date',
@@ -539,22 +738,13 @@ def analytics_page():
 
         # Query categories
         st.markdown("### 📂 Query Categories")
-        cursor.execute("""
-            SELECT
-                category,
-                COUNT(*) as count
-            FROM queries
-            WHERE category IS NOT NULL
-            GROUP BY category
-            ORDER BY count DESC
-        """)
-        category_data = cursor.fetchall()
+        category_data = data['category_data']
 
         if category_data:
             col1, col2 = st.columns([2, 1])
 
             with col1:
-                df_categories = pd.DataFrame(category_data)
+                df_categories = pd.DataFrame.from_records(category_data, columns=['category', 'count'])
                 fig = px.pie(
                     df_categories,
                     values='count',
@@ -567,8 +757,8 @@ def analytics_page():
 
             with col2:
                 st.markdown("**Category Breakdown:**")
-                for cat in category_data:
-                    st.markdown(f"- **{cat['category']}**: {cat['count']} queries")
+                for category, count in category_data:
+                    st.markdown(f"- **{category}**: {count} queries")
         else:
             st.info("No categorized queries yet. Submit some inquiries to see category statistics!")
 
@@ -579,19 +769,10 @@ def analytics_page():
 
         col1, col2, col3 = st.columns(3)
 
-        # Count analyzed feedback
-        cursor.execute("SELECT COUNT(*) as count FROM feedback WHERE summary IS NOT NULL")
-        analyzed_count = cursor.fetchone()['count']
+        analyzed_count = data['analyzed_count']
+        docs_flagged = data['docs_flagged']
         col1.metric("Analyzed Comments", analyzed_count)
-
-        # Count feedback needing review (severe or moderate severity)
-        cursor.execute("SELECT COUNT(*) as count FROM feedback WHERE severity IN ('severe', 'moderate')")
-        needs_review_count = cursor.fetchone()['count']
-        col2.metric("Comments Flagged", needs_review_count, help="Feedback requiring attention")
-
-        # Count documents flagged for review
-        cursor.execute("SELECT COUNT(*) as count FROM document_review_flags WHERE status = 'pending'")
-        docs_flagged = cursor.fetchone()['count']
+        col2.metric("Comments Flagged", data['needs_review_count'], help="Feedback requiring attention")
         col3.metric("Documents Flagged", docs_flagged, help="Documents needing manual review")
 
         if analyzed_count > 0:
@@ -600,25 +781,10 @@ def analytics_page():
             # Issue type distribution
             with col1:
                 st.markdown("**Common Issues Identified:**")
-                cursor.execute("""
-                    SELECT
-                        issue,
-                        COUNT(*) as count
-                    FROM feedback
-                    CROSS JOIN UNNEST(issues) as issue
-                    WHERE issues IS NOT NULL
-                      AND array_length(issues, 1) > 0
-                      AND issue != 'none'
-                    GROUP BY issue
-                    ORDER BY count DESC
-                    LIMIT 8;
-                """)
-                issue_data = cursor.fetchall()
-
-                if issue_data:
-                    df_issues = pd.DataFrame(issue_data)
+                if data['issue_data']:
+                    df_issues = pd.DataFrame.from_records(data['issue_data'], columns=['issue', 'count'])
                     # Format issue names for display
-                    df_issues['issue'] = df_issues['issue'].str.replace('_', ' ').str.title()
+                    df_issues['issue'] = [issue.replace('_', ' ').title() for issue in df_issues['issue']]
                     fig = px.bar(
                         df_issues,
                         x='count',
@@ -636,28 +802,12 @@ def analytics_page():
             # Severity distribution
             with col2:
                 st.markdown("**Issue Severity Distribution:**")
-                cursor.execute("""
-                    SELECT severity, COUNT(*) as count
-                    FROM feedback
-                    WHERE severity IS NOT NULL AND severity != 'none'
-                    GROUP BY severity
-                    ORDER BY
-                        CASE severity
-                            WHEN 'severe' THEN 1
-                            WHEN 'moderate' THEN 2
-                            WHEN 'minor' THEN 3
-                            ELSE 4
-                        END;
-                """)
-                severity_data = cursor.fetchall()
-
-                if severity_data:
-                    df_severity = pd.DataFrame(severity_data)
+                if data['severity_data']:
+                    df_severity = pd.DataFrame.from_records(data['severity_data'], columns=['severity', 'count'])
                     df_severity['severity'] = df_severity['severity'].str.title()
 
                     # Custom colors for severity
                     colors = {'Severe': '#d62728', 'Moderate': '#ff7f0e', 'Minor': '#2ca02c'}
-                    df_severity['color'] = df_severity['severity'].map(colors)
 
                     fig = px.pie(
                         df_severity,
@@ -675,30 +825,15 @@ def analytics_page():
         # Documents needing review
         if docs_flagged > 0:
             st.markdown("**📋 Documents Requiring Review:**")
-            cursor.execute("""
-                SELECT
-                    drf.document_id,
-                    drf.reason,
-                    drf.total_feedbacks,
-                    drf.flagged_at,
-                    d.content,
-                    d.metadata
-                FROM document_review_flags drf
-                JOIN documents d ON drf.document_id = d.id
-                WHERE drf.status = 'pending'
-                ORDER BY drf.flagged_at DESC
-                LIMIT 5;
-            """)
-            flagged_docs = cursor.fetchall()
+            flagged_docs = data['flagged_docs']
 
             for doc in flagged_docs:
-                source_title = doc['metadata'].get('source_title', 'Unknown') if doc['metadata'] else 'Unknown'
-                source_url = doc['metadata'].get('source_url', '') if doc['metadata'] else ''
-                with st.expander(f"⚠️ Document #{doc['document_id']}: {source_title[:60]}..."):
+                source_url = doc['source_url']
+                with st.expander(f"⚠️ Document #{doc['document_id']}: {doc['source_title'][:60]}..."):
                     st.markdown(f"**Reason:** {doc['reason']}")
                     st.markdown(f"**Total Feedback:** {doc['total_feedbacks']}")
-                    st.markdown(f"**Flagged:** {doc['flagged_at'].strftime('%m/%d/%Y %I:%M %p')}")
-                    st.markdown(f"**Content Preview:** {doc['content'][:300]}...")
+                    st.markdown(f"**Flagged:** {doc['flagged_ts']}")
+                    st.markdown(f"**Content Preview:** {doc['content_preview']}...")
                     if source_url:
                         st.markdown(f"**Source:** [{source_url}]({source_url})")
 
@@ -706,36 +841,14 @@ def analytics_page():
 
         # Recent feedback
         st.markdown("### 💬 Recent Feedback")
-        cursor.execute("""
-            SELECT
-                f.rating,
-                f.comment,
-                f.created_at,
-                f.sentiment,
-                f.issues,
-                f.severity,
-                f.summary,
-                q.query_text,
-                r.response_text
-            FROM feedback f
-            JOIN responses r ON f.response_id = r.id
-            JOIN queries q ON r.query_id = q.id
-            ORDER BY f.created_at DESC
-            LIMIT 10
-        """)
-        recent_feedback = cursor.fetchall()
+        recent_feedback = data['recent_feedback']
 
         if recent_feedback:
             for i, fb in enumerate(recent_feedback):
-                # Create title with severity indicator
-                severity_emoji = ''
-                if fb.get('severity') and fb['severity'] != 'none':
-                    severity_emoji = {'minor': '⚡', 'moderate': '⚠️', 'severe': '🚨'}.get(fb['severity'], '') + ' '
-
-                # Display as list item with button
+                # Display as list item with button (severity prefix and timestamp formatted in SQL)
                 col1, col2 = st.columns([6, 1])
                 with col1:
-                    st.markdown(f"{severity_emoji}{'⭐' * fb['rating']} - {fb['created_at'].strftime('%m/%d/%Y %I:%M %p')}")
+                    st.markdown(f"{fb['sev_prefix']}{'⭐' * fb['rating']} - {fb['ts']}")
                     st.caption(f"{fb['query_text'][:100]}...")
                 with col2:
                     if st.button("View", key=f"view_fb_{i}"):
@@ -749,30 +862,92 @@ def analytics_page():
         # Top queries
         st.markdown("---")
         st.markdown("### 🔝 Most Common Queries")
-        cursor.execute("""
-            SELECT query_text, COUNT(*) as count
-            FROM queries
-            GROUP BY query_text
-            HAVING COUNT(*) > 1
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        top_queries = cursor.fetchall()
+        top_queries = data['top_queries']
 
         if top_queries:
-            df_top = pd.DataFrame(top_queries)
+            df_top = pd.DataFrame.from_records(top_queries, columns=['query_text', 'count'])
             st.dataframe(df_top, use_container_width=True, hide_index=True)
         else:
             st.info("No repeated queries yet")
 
-        cursor.close()
-        conn.close()
-
     except Exception as e:
+        logger.exception("Error loading analytics")
         st.error(f"Error loading analytics: {e}")
 
+@ttl_cache('source_stats', ttl=30)
+def _fetch_source_stats():
+    """Fetch per-source-type document statistics for external content."""
+    db = Database()
+    with db:
+        db.cursor.execute("""
+            SELECT
+                source_type,
+                COUNT(*) as document_count,
+                MAX(last_refreshed) as last_refresh,
+                COUNT(DISTINCT source_url) as unique_urls,
+                MAX(MAX(last_refreshed)) OVER () as overall_refresh,
+                SUM(COUNT(*)) OVER ()::int as total_documents
+            FROM documents
+            WHERE is_external_source = TRUE
+            GROUP BY source_type
+            ORDER BY source_type
+        """)
+        return [dict(row) for row in db.cursor.fetchall()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_refresh_log():
+    """Fetch the 20 most recent source refresh log entries."""
+    db = Database()
+    with db:
+        db.execute_prepared('refresh_log_q')
+        return [dict(row) for row in db.cursor.fetchall()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_sample_docs():
+    """Fetch the 10 most recently refreshed external source documents."""
+    db = Database()
+    with db:
+        db.execute_prepared('sample_docs_q')
+        return [dict(row) for row in db.cursor.fetchall()]
+
+@st.fragment(run_every="30s")
+def _refresh_history_fragment():
+    """Render the refresh log; reruns on its own schedule, independent of page widgets."""
+    refresh_log = _fetch_refresh_log()
+
+    if refresh_log:
+        for log in refresh_log:
+            status_icon = "✅" if log['status'] == 'completed' else "❌" if log['status'] == 'failed' else "⏳"
+            with st.expander(f"{status_icon} {log['source_type']} - {log['refresh_started']:%m/%d/%Y %I:%M %p}"):
+                duration = f"{log['duration_s']:.1f} seconds" if log['duration_s'] is not None else "—"
+                st.markdown(
+                    f"**Added:** {log['documents_added']} | "
+                    f"**Deleted:** {log['documents_deleted']} | "
+                    f"**Status:** {log['status']}  \n"
+                    f"**Duration:** {duration}"
+                )
+
+                if log['error_message']:
+                    st.error(f"Error: {log['error_message']}")
+    else:
+        st.info("No refresh history yet")
+
+
+@st.cache_resource
+def get_recalc_executor():
+    """Single worker that recalculates URL-level scores after a refresh, shared by all sessions."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="score-recalc")
+
+def _recalculate_source_scores():
+    """Recalculate URL-level scores on a dedicated connection (runs off the script thread)."""
+    db = Database()
+    with db:
+        db.calculate_source_document_scores(use_enhanced_scores=True)
+
 def source_management_page():
     """Manage external source content (Federal Reserve, etc.)."""
+    import pandas as pd
+
     st.markdown('<div class="main-header">📚 Source Content Management</div>', unsafe_allow_html=True)
 
     st.markdown("""
@@ -780,35 +955,32 @@ def source_management_page():
     This content is automatically refreshed and used to answer queries.
     """)
 
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+    # Background URL-level score recalculation started by "Refresh Now"
+    recalc_fut = st.session_state.get('_recalc_fut')
+    if recalc_fut is not None:
+        if not recalc_fut.done():
+            st.info("⏳ Recalculating URL-level scores in the background...")
+        else:
+            del st.session_state['_recalc_fut']
+            if recalc_fut.exception():
+                st.error(f"❌ Score recalculation failed: {recalc_fut.exception()}")
+            else:
+                st.success("✅ URL-level scores recalculated")
 
+    try:
         # Source statistics
         st.markdown("### 📊 Content Sources")
 
-        cursor.execute("""
-            SELECT
-                source_type,
-                COUNT(*) as document_count,
-                MAX(last_refreshed) as last_refresh,
-                COUNT(DISTINCT source_url) as unique_urls
-            FROM documents
-            WHERE is_external_source = TRUE
-            GROUP BY source_type
-            ORDER BY source_type
-        """)
-        sources = cursor.fetchall()
+        sources = _fetch_source_stats()
 
         if sources:
             col1, col2, col3 = st.columns(3)
 
-            total_docs = sum(s['document_count'] for s in sources)
-            col1.metric("Total Source Documents", total_docs)
+            col1.metric("Total Source Documents", sources[0]['total_documents'])
             col2.metric("Source Types", len(sources))
 
-            # Most recent refresh
-            most_recent = max((s['last_refresh'] for s in sources if s['last_refresh']), default=None)
+            # Most recent refresh (computed across all source types in SQL)
+            most_recent = sources[0]['overall_refresh']
             if most_recent:
                 col3.metric("Last Refresh", most_recent.strftime('%m/%d/%Y %I:%M %p'))
             else:
@@ -817,9 +989,12 @@ def source_management_page():
             # Sources table
             st.markdown("---")
             st.markdown("### 📋 Source Breakdown")
-            df_sources = pd.DataFrame(sources)
-            df_sources['last_refresh'] = df_sources['last_refresh'].apply(
-                lambda x: x.strftime('%m/%d/%Y %I:%M %p') if x else 'Never'
+            df_sources = pd.DataFrame(
+                sources, columns=['source_type', 'document_count', 'last_refresh', 'unique_urls']
+            )
+            last_refresh = pd.to_datetime(df_sources['last_refresh'], errors='coerce')
+            df_sources['last_refresh'] = last_refresh.dt.strftime('%m/%d/%Y %I:%M %p').where(
+                last_refresh.notna(), 'Never'
             )
             st.dataframe(df_sources, use_container_width=True, hide_index=True)
         else:
@@ -829,38 +1004,7 @@ def source_management_page():
         st.markdown("---")
         st.markdown("### 📅 Refresh History")
 
-        cursor.execute("""
-            SELECT
-                source_type,
-                documents_added,
-                documents_deleted,
-                refresh_started,
-                refresh_completed,
-                status,
-                error_message
-            FROM source_refresh_log
-            ORDER BY refresh_started DESC
-            LIMIT 20
-        """)
-        refresh_log = cursor.fetchall()
-
-        if refresh_log:
-            for log in refresh_log:
-                status_icon = "✅" if log['status'] == 'completed' else "❌" if log['status'] == 'failed' else "⏳"
-                with st.expander(f"{status_icon} {log['source_type']} - {log['refresh_started'].strftime('%m/%d/%Y %I:%M %p')}"):
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric("Added", log['documents_added'])
-                    col2.metric("Deleted", log['documents_deleted'])
-                    col3.metric("Status", log['status'])
-
-                    if log['error_message']:
-                        st.error(f"Error: {log['error_message']}")
-
-                    if log['refresh_completed']:
-                        duration = (log['refresh_completed'] - log['refresh_started']).total_seconds()
-                        st.info(f"Duration: {duration:.1f} seconds")
-        else:
-            st.info("No refresh history yet")
+        _refresh_history_fragment()
 
         # Manual refresh controls
         st.markdown("---")
@@ -872,30 +1016,53 @@ def source_management_page():
 
         with col1:
             if st.button("🔄 Refresh Now", type="primary"):
-                with st.spinner("Refreshing content... This may take a few minutes."):
-                    try:
-                        import asyncio
-                        from fed_content_importer import FedContentImporter
-
-                        # Create importer and run crawl
-                        importer = FedContentImporter()
-
-                        # Run the async crawl function
-                        asyncio.run(importer.crawl_and_import())
-
-                        st.success("✅ Refresh completed successfully!")
-
-                        # Also recalculate URL-level scores after refresh
-                        from database import Database
-                        refresh_db = Database()
-                        with refresh_db:
-                            refresh_db.calculate_source_document_scores(use_enhanced_scores=True)
+                # Only one crawl at a time across all sessions and replicas: claim the
+                # refresh slot (a row in source_refresh_log) before crawling
+                with Database() as claim_db:
+                    claim_id = claim_db.claim_refresh()
 
+                if claim_id is None:
+                    st.warning("⏳ Another refresh is already in progress. Please try again in a few minutes.")
+                else:
+                    refresh_error = None
+                    try:
+                        with st.spinner("Refreshing content... This may take a few minutes."):
+                            try:
+                                import asyncio
+                                from fed_content_importer import FedContentImporter
+
+                                # Create importer and run crawl
+                                importer = FedContentImporter()
+
+                                # Run the async crawl on the shared background loop
+                                asyncio.run_coroutine_threadsafe(
+                                    importer.crawl_and_import(), get_event_loop()
+                                ).result()
+
+                                st.success("✅ Refresh completed successfully!")
+
+                                # Recalculate URL-level scores in the background; the
+                                # status row at the top of the page reports completion
+                                st.session_state['_recalc_fut'] = get_recalc_executor().submit(_recalculate_source_scores)
+
+                                _fetch_refresh_log.clear()
+                                _fetch_sample_docs.clear()
+                                _fetch_source_stats.clear()
+                                _fetch_document_stats.clear()
+                                answer_cache.clear()
+                                refreshed = True
+                            except Exception as e:
+                                refreshed = False
+                                refresh_error = str(e)
+                                st.error(f"❌ Refresh failed: {e}")
+                                logger.exception("Refresh failed")
+                                st.code(traceback.format_exc())
+                    finally:
+                        with Database() as claim_db:
+                            claim_db.release_refresh(claim_id, refresh_error)
+
+                    if refreshed:
                         st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ Refresh failed: {e}")
-                        import traceback
-                        st.code(traceback.format_exc())
 
         with col2:
             st.info("""
@@ -913,35 +1080,127 @@ def source_management_page():
         st.markdown("---")
         st.markdown("### 📄 Sample Source Documents")
 
-        cursor.execute("""
-            SELECT
-                source_type,
-                source_title,
-                source_url,
-                LEFT(content, 200) as preview,
-                last_refreshed
-            FROM documents
-            WHERE is_external_source = TRUE
-            ORDER BY last_refreshed DESC
-            LIMIT 10
-        """)
-        samples = cursor.fetchall()
+        samples = _fetch_sample_docs()
 
         if samples:
             for doc in samples:
                 with st.expander(f"{doc['source_type']}: {doc['source_title']}"):
-                    st.markdown(f"**URL:** {doc['source_url']}")
-                    st.markdown(f"**Refreshed:** {doc['last_refreshed'].strftime('%m/%d/%Y %I:%M %p')}")
-                    st.markdown(f"**Preview:** {doc['preview']}...")
+                    st.markdown(
+                        f"**URL:** {doc['source_url']}  \n"
+                        f"**Refreshed:** {doc['last_refreshed']:%m/%d/%Y %I:%M %p}  \n"
+                        f"**Preview:** {doc['preview']}..."
+                    )
         else:
             st.info("No source documents yet")
 
-        cursor.close()
-        conn.close()
-
     except Exception as e:
+        logger.exception("Error loading source management")
         st.error(f"Error loading source management: {e}")
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_document_stats():
+    """Fetch (total documents, last federalreserve.gov update) in one pass over documents."""
+    db = Database()
+    with db:
+        db.cursor.execute("""
+            SELECT
+                COUNT(*) as count,
+                MAX(created_at) FILTER (
+                    WHERE metadata->>'source_url' LIKE '%federalreserve.gov%'
+                ) as last_update
+            FROM documents;
+        """)
+        stats = db.cursor.fetchone()
+    return stats['count'], stats['last_update']
+
+# Long-form copy for the How It Works page, built once at import instead of on every rerun
+_ARCH_TAB_MD = """
+This diagram shows the high-level architecture of the Federal Reserve RAG system,
+including:
+- **PII Redactor** (Microsoft Presidio with spaCy NER) for privacy protection
+- **Streamlit UI** with multiple pages
+- **RAG Core Components** including query processing, embedding, retrieval, and response generation
+- **Feedback Analyzer** using Claude for AI-powered sentiment analysis
+- **Claude Sonnet 4** integration for categorization and response generation
+- **PostgreSQL + pgvector** for vector similarity search and data storage
+"""
+
+_QUERY_FLOW_MD = """
+This diagram illustrates the complete flow of a user query through the system:
+
+**Main Query Flow (left to right):**
+1. **Privacy Protection**: PII redaction with Microsoft Presidio (spaCy NER) before storage
+2. **Query Analysis**: Category detection and vector embedding
+3. **Document Retrieval**: Vector search and hybrid ranking with enhanced feedback scores
+4. **Response Generation**: Claude generates cited responses
+5. **AI Feedback Analysis**: Comments analyzed for sentiment, issues, and severity
+
+The **feedback loop** (shown in blue dashed line) connects back to ranking,
+enabling continuous improvement based on user ratings and AI-analyzed comments.
+"""
+
+_CONTENT_PIPE_MD = """
+This diagram shows how Federal Reserve content is crawled from the website,
+processed into chunks, converted to vector embeddings, and stored in the PostgreSQL database.
+"""
+
+_PII_MD = """
+**Automatic PII Detection and Redaction:**
+
+Before your question is processed or stored, the system uses **Microsoft Presidio**
+with **spaCy NER** to automatically detect and redact:
+
+**Pattern-Based Detection (Regex):**
+- 📧 Email addresses → `[REDACTED_EMAIL]`
+- 📞 Phone numbers → `[REDACTED_PHONE]`
+- 🆔 Social Security Numbers → `[REDACTED_SSN]`
+- 💳 Credit card numbers → `[REDACTED_CARD]`
+- 🌐 IP addresses → `[REDACTED_IP]`
+- 🏦 Account numbers → `[REDACTED_ACCOUNT]`
+
+**AI-Based Detection (Presidio + spaCy NER):**
+- 👤 Person names → `[REDACTED_NAME]`
+- 📍 Locations → `[REDACTED_LOCATION]`
+- 🏢 Organizations → `[REDACTED_ORG]` (except Federal Reserve entities)
+- 📅 Dates → `[REDACTED_DATE]`
+- 🆔 IDs (driver licenses, passports) → `[REDACTED_ID]`
+- 🔗 URLs → `[REDACTED_URL]`
+
+**Important:** Original queries with PII are **NEVER stored** in the database. Only redacted versions are kept.
+"""
+
+_RETRIEVAL_STEPS_MD = """
+When you submit a question, the system:
+
+1. **Detects and redacts PII** - Removes sensitive information locally using Microsoft Presidio with spaCy NER
+2. **Detects query category** - Uses Claude to classify the topic (e.g., "Monetary Policy")
+3. **Converts your question to a vector embedding** - A numerical representation that captures semantic meaning
+4. **Searches the document database** - Uses vector similarity to find the most relevant content
+5. **Ranks results using a hybrid scoring system:**
+"""
+
+_FEEDBACK_STEPS_MD = """
+**When you provide feedback, the system:**
+
+1. **Analyzes your comment with AI** (if provided):
+   - Extracts sentiment: Positive, Neutral, or Negative
+   - Identifies issues: outdated_info, incorrect_info, too_technical, missing_citations, etc.
+   - Assigns severity: minor, moderate, or severe
+   - Generates a summary of your feedback
+
+2. **Calculates Enhanced Feedback Score:**
+   - Combines star rating (70%) + sentiment analysis (30%)
+   - Applies penalties for severe issues
+   - Adjusts based on confidence level
+
+3. **Flags documents for review** when:
+   - Multiple users report similar issues
+   - Severe problems are detected
+   - Consistently low ratings with negative comments
+
+4. **Updates document rankings** - Better documents rank higher in future searches
+"""
+
 def how_it_works_page():
     """Informational page about the RAG system."""
     st.markdown('<div class="main-header">ℹ️ How It Works</div>', unsafe_allow_html=True)
@@ -966,52 +1225,34 @@ def how_it_works_page():
     st.markdown("---")
     st.markdown("## 🏗️ System Architecture")
 
-    # Generate diagrams if they don't exist
-    if ensure_diagrams_exist():
+    # Generate diagrams if they don't exist; once they do, skip the file checks
+    # for the rest of the session
+    if not st.session_state.get('diagrams_ok'):
+        st.session_state['diagrams_ok'] = ensure_diagrams_exist()
+        st.session_state['diagram_exists'] = {f: Path(f).exists() for f in DIAGRAM_FILES}
+    diagram_exists = st.session_state['diagram_exists']
+
+    if st.session_state['diagrams_ok']:
         # Create tabs for different diagrams
         tab1, tab2, tab3 = st.tabs(["🏗️ System Architecture", "🔄 Query Flow Pipeline", "📥 Content Processing"])
 
         with tab1:
-            st.markdown("""
-            This diagram shows the high-level architecture of the Federal Reserve RAG system,
-            including:
-            - **PII Redactor** (Microsoft Presidio with spaCy NER) for privacy protection
-            - **Streamlit UI** with multiple pages
-            - **RAG Core Components** including query processing, embedding, retrieval, and response generation
-            - **Feedback Analyzer** using Claude for AI-powered sentiment analysis
-            - **Claude Sonnet 4** integration for categorization and response generation
-            - **PostgreSQL + pgvector** for vector similarity search and data storage
-            """)
-            if Path('images/rag_architecture.png').exists():
+            st.markdown(_ARCH_TAB_MD)
+            if diagram_exists['images/rag_architecture.png']:
                 st.image('images/rag_architecture.png', use_container_width=True)
             else:
                 st.warning("Architecture diagram not available")
 
         with tab2:
-            st.markdown("""
-            This diagram illustrates the complete flow of a user query through the system:
-
-            **Main Query Flow (left to right):**
-            1. **Privacy Protection**: PII redaction with Microsoft Presidio (spaCy NER) before storage
-            2. **Query Analysis**: Category detection and vector embedding
-            3. **Document Retrieval**: Vector search and hybrid ranking with enhanced feedback scores
-            4. **Response Generation**: Claude generates cited responses
-            5. **AI Feedback Analysis**: Comments analyzed for sentiment, issues, and severity
-
-            The **feedback loop** (shown in blue dashed line) connects back to ranking,
-            enabling continuous improvement based on user ratings and AI-analyzed comments.
-            """)
-            if Path('images/rag_query_flow.png').exists():
+            st.markdown(_QUERY_FLOW_MD)
+            if diagram_exists['images/rag_query_flow.png']:
                 st.image('images/rag_query_flow.png', use_container_width=True)
             else:
                 st.warning("Query flow diagram not available")
 
         with tab3:
-            st.markdown("""
-            This diagram shows how Federal Reserve content is crawled from the website,
-            processed into chunks, converted to vector embeddings, and stored in the PostgreSQL database.
-            """)
-            if Path('images/rag_content_pipeline.png').exists():
+            st.markdown(_CONTENT_PIPE_MD)
+            if diagram_exists['images/rag_content_pipeline.png']:
                 st.image('images/rag_content_pipeline.png', use_container_width=True)
             else:
                 st.warning("Content pipeline diagram not available")
@@ -1039,17 +1280,7 @@ def how_it_works_page():
 
     with col2:
         try:
-            db = Database()
-            with db:
-                db.cursor.execute("SELECT COUNT(*) as count FROM documents;")
-                doc_count = db.cursor.fetchone()['count']
-
-                db.cursor.execute("""
-                    SELECT MAX(created_at) as last_update
-                    FROM documents
-                    WHERE metadata->>'source_url' LIKE '%federalreserve.gov%';
-                """)
-                last_update = db.cursor.fetchone()['last_update']
+            doc_count, last_update = _fetch_document_stats()
 
             st.metric("Total Documents", f"{doc_count:,}")
             if last_update:
@@ -1064,30 +1295,7 @@ def how_it_works_page():
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        st.markdown("""
-        **Automatic PII Detection and Redaction:**
-
-        Before your question is processed or stored, the system uses **Microsoft Presidio**
-        with **spaCy NER** to automatically detect and redact:
-
-        **Pattern-Based Detection (Regex):**
-        - 📧 Email addresses → `[REDACTED_EMAIL]`
-        - 📞 Phone numbers → `[REDACTED_PHONE]`
-        - 🆔 Social Security Numbers → `[REDACTED_SSN]`
-        - 💳 Credit card numbers → `[REDACTED_CARD]`
-        - 🌐 IP addresses → `[REDACTED_IP]`
-        - 🏦 Account numbers → `[REDACTED_ACCOUNT]`
-
-        **AI-Based Detection (Presidio + spaCy NER):**
-        - 👤 Person names → `[REDACTED_NAME]`
-        - 📍 Locations → `[REDACTED_LOCATION]`
-        - 🏢 Organizations → `[REDACTED_ORG]` (except Federal Reserve entities)
-        - 📅 Dates → `[REDACTED_DATE]`
-        - 🆔 IDs (driver licenses, passports) → `[REDACTED_ID]`
-        - 🔗 URLs → `[REDACTED_URL]`
-
-        **Important:** Original queries with PII are **NEVER stored** in the database. Only redacted versions are kept.
-        """)
+        st.markdown(_PII_MD)
 
     with col2:
         st.info("""
@@ -1113,15 +1321,7 @@ def how_it_works_page():
     st.markdown("---")
     st.markdown("## 🔍 How Document Retrieval Works")
 
-    st.markdown("""
-    When you submit a question, the system:
-
-    1. **Detects and redacts PII** - Removes sensitive information locally using Microsoft Presidio with spaCy NER
-    2. **Detects query category** - Uses Claude to classify the topic (e.g., "Monetary Policy")
-    3. **Converts your question to a vector embedding** - A numerical representation that captures semantic meaning
-    4. **Searches the document database** - Uses vector similarity to find the most relevant content
-    5. **Ranks results using a hybrid scoring system:**
-    """)
+    st.markdown(_RETRIEVAL_STEPS_MD)
 
     st.code("""
 Final Score = Similarity Score × (1 + Feedback Weight × URL Enhanced Score)
@@ -1154,27 +1354,7 @@ This ensures learning persists even when documents are refreshed!
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("""
-        **When you provide feedback, the system:**
-
-        1. **Analyzes your comment with AI** (if provided):
-           - Extracts sentiment: Positive, Neutral, or Negative
-           - Identifies issues: outdated_info, incorrect_info, too_technical, missing_citations, etc.
-           - Assigns severity: minor, moderate, or severe
-           - Generates a summary of your feedback
-
-        2. **Calculates Enhanced Feedback Score:**
-           - Combines star rating (70%) + sentiment analysis (30%)
-           - Applies penalties for severe issues
-           - Adjusts based on confidence level
-
-        3. **Flags documents for review** when:
-           - Multiple users report similar issues
-           - Severe problems are detected
-           - Consistently low ratings with negative comments
-
-        4. **Updates document rankings** - Better documents rank higher in future searches
-        """)
+        st.markdown(_FEEDBACK_STEPS_MD)
 
     with col2:
         st.markdown("""
@@ -1326,22 +1506,24 @@ Enhanced Score =
         """)
 
 @st.dialog("Response Details", width="large")
-def show_response_dialog(response, db):
+def show_response_dialog(response_id, db):
     """Show detailed response in a dialog."""
-    from datetime import datetime
+    with db:
+        response = db.get_response_details(response_id)
+
+    if not response:
+        st.warning(f"Response #{response_id} no longer exists")
+        return
 
     # Selection checkbox
-    is_selected = st.checkbox(
+    st.checkbox(
         f"Select response #{response['id']}",
         value=response['id'] in st.session_state.selected_responses,
-        key=f"dialog_select_{response['id']}"
+        key=f"dialog_select_{response['id']}",
+        on_change=_toggle_response,
+        args=(response['id'], f"dialog_select_{response['id']}")
     )
 
-    if is_selected:
-        st.session_state.selected_responses.add(response['id'])
-    else:
-        st.session_state.selected_responses.discard(response['id'])
-
     st.markdown(f"**Query:** {response['query_text']}")
     st.markdown("**Response:**")
     st.markdown(response['response_text'])
@@ -1352,64 +1534,101 @@ def show_response_dialog(response, db):
     # Display all feedback if available
     if response.get('all_feedback') and response['all_feedback']:
         st.markdown("---")
-        fb_with_comments = sum(1 for fb in response['all_feedback'] if fb and fb.get('has_comment'))
+        fb_with_comments = sum(1 for fb in response['all_feedback'] if fb['has_comment'])
         st.markdown(f"**📝 Feedback ({response.get('feedback_count', 0)} total, {fb_with_comments} with comments):**")
 
         for i, fb in enumerate(response['all_feedback'], 1):
-            if fb:  # fb might be None from the array_agg
-                # Format the feedback display
-                fb_date = fb.get('created_at', '')
-                if fb_date:
-                    if isinstance(fb_date, str):
-                        fb_date = datetime.fromisoformat(fb_date).strftime('%m/%d/%Y %I:%M %p')
-                    else:
-                        fb_date = fb_date.strftime('%m/%d/%Y %I:%M %p')
-
-                # Build severity indicator
-                severity_emoji = ''
-                if fb.get('severity') and fb['severity'] != 'none':
-                    severity_map = {'minor': '⚡', 'moderate': '⚠️', 'severe': '🚨'}
-                    severity_emoji = severity_map.get(fb['severity'], '')
-
-                # Display rating and date
-                st.markdown(f"{severity_emoji} **{i}.** {'⭐' * fb.get('rating', 0)} - {fb_date}")
-
-                # Display comment if present
-                if fb.get('has_comment') and fb.get('comment'):
-                    st.info(fb.get('comment', ''))
-                else:
-                    st.caption("_(No comment provided)_")
-
-                # Show analysis if available (support both old and new column names)
-                analysis_parts = []
-                # Handle both string sentiment and numeric sentiment_score
-                sentiment_str = fb.get('sentiment')
-                if sentiment_str:
-                    analysis_parts.append(f"Sentiment: {sentiment_str.title()}")
-                elif fb.get('sentiment_score') is not None:
-                    sentiment = fb['sentiment_score']
-                    sentiment_label = 'Positive' if sentiment > 0.3 else 'Negative' if sentiment < -0.3 else 'Neutral'
-                    analysis_parts.append(f"Sentiment: {sentiment_label} ({sentiment:.2f})")
-
-                issues = fb.get('issues') or fb.get('issue_types') or []
-                if issues:
-                    issue_list = [issue for issue in issues if issue != 'none']
-                    if issue_list:
-                        analysis_parts.append(f"Issues: {', '.join(issue_list).replace('_', ' ').title()}")
-
-                if analysis_parts:
-                    st.caption(" | ".join(analysis_parts))
+            # Display rating and date (fields pre-formatted by the feedback_display view)
+            st.markdown(f"{fb['severity_emoji']} **{i}.** {'⭐' * fb['rating']} - {fb['created_at_str']}")
+
+            # Display comment if present
+            if fb['has_comment']:
+                st.info(fb['comment'])
+            else:
+                st.caption("_(No comment provided)_")
+
+            # Show analysis if available
+            analysis_parts = []
+            if fb['sentiment_label']:
+                analysis_parts.append(f"Sentiment: {fb['sentiment_label']}")
+            if fb['issues_str']:
+                analysis_parts.append(f"Issues: {fb['issues_str']}")
+
+            if analysis_parts:
+                st.caption(" | ".join(analysis_parts))
 
     # Delete button
     st.markdown("---")
     if st.button(f"🗑️ Delete Response #{response['id']}", type="secondary", use_container_width=True):
         with db:
             if db.delete_response(response['id']):
+                _invalidate_deleted_responses()
                 st.success(f"Deleted response #{response['id']}")
                 st.rerun()
 
+def _reset_response_editor():
+    """Give the response grid a new key so it re-reads Select values from selected_responses."""
+    st.session_state.resp_editor_version = st.session_state.get('resp_editor_version', 0) + 1
+
+def _reset_response_pages():
+    """Go back to the first page of the response list (e.g. when a filter changes)."""
+    st.session_state.resp_page_cursors = []
+
+def _toggle_response(response_id, key):
+    """Checkbox callback: sync one response's selection into selected_responses."""
+    if st.session_state[key]:
+        st.session_state.selected_responses.add(response_id)
+    else:
+        st.session_state.selected_responses.discard(response_id)
+    _reset_response_editor()
+
+def _toggle_all_responses():
+    """Checkbox callback: select or deselect every response on the current page."""
+    page_ids = st.session_state.current_page_ids
+    if st.session_state.select_all_page:
+        st.session_state.selected_responses.update(page_ids)
+    else:
+        st.session_state.selected_responses.difference_update(page_ids)
+    _reset_response_editor()
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _fetch_data_counts():
+    """Fetch (responses, feedback, queries) row counts in one round trip."""
+    db = Database()
+    with db:
+        db.execute_prepared('data_counts_q')
+        row = db.cursor.fetchone()
+    return row['r'], row['f'], row['q']
+
+def _render_data_counts(slot):
+    """Draw the Current Data metrics into a placeholder so they can be redrawn in place."""
+    total_responses, total_feedback, total_queries = _fetch_data_counts()
+    with slot.container():
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Responses", total_responses)
+        col2.metric("Total Feedback", total_feedback)
+        col3.metric("Total Queries", total_queries)
+
+DELETE_ALL_SUCCESS_TPL = """
+**All user data has been deleted:**
+- 🗑️ {queries} queries
+- 🗑️ {responses} responses
+- 🗑️ {feedback} feedback items
+- 🗑️ {document_flags} document review flags
+- 🗑️ {document_scores} chunk-level scores reset
+- 🗑️ {source_document_scores} URL-level scores reset
+
+**System has been reset to fresh state with only source documents.**
+"""
+
+@st.fragment
 def data_management_page():
-    """Page for managing responses and feedback."""
+    """Page for managing responses and feedback.
+
+    Runs as a fragment: filters and delete buttons rerun only this page, not the sidebar.
+    """
+    import pandas as pd
+
     st.markdown('<div class="main-header">🗑️ Data Management</div>', unsafe_allow_html=True)
 
     st.markdown("""
@@ -1422,21 +1641,10 @@ def data_management_page():
 
         # Summary statistics
         st.markdown("### Current Data")
-        col1, col2, col3 = st.columns(3)
-
-        with db:
-            db.cursor.execute("SELECT COUNT(*) as count FROM responses;")
-            total_responses = db.cursor.fetchone()['count']
-
-            db.cursor.execute("SELECT COUNT(*) as count FROM feedback;")
-            total_feedback = db.cursor.fetchone()['count']
-
-            db.cursor.execute("SELECT COUNT(*) as count FROM queries;")
-            total_queries = db.cursor.fetchone()['count']
-
-        col1.metric("Total Responses", total_responses)
-        col2.metric("Total Feedback", total_feedback)
-        col3.metric("Total Queries", total_queries)
+        counts_slot = st.empty()
+        _render_data_counts(counts_slot)
+        if 'data_reset_at' in st.session_state:
+            st.caption(f"All user data was reset at {datetime.fromtimestamp(st.session_state['data_reset_at']):%m/%d/%Y %I:%M %p}")
 
         st.markdown("---")
 
@@ -1452,8 +1660,9 @@ def data_management_page():
             if st.button("🗑️ Delete Old Responses", type="secondary"):
                 with db:
                     deleted = db.delete_old_responses(days_old)
+                _invalidate_deleted_responses()
                 st.success(f"Deleted {deleted} responses older than {days_old} days")
-                st.rerun()
+                st.rerun(scope="fragment")
 
         with col2:
             st.markdown("#### Delete by Rating")
@@ -1461,21 +1670,14 @@ def data_management_page():
 
             if st.button("🗑️ Delete Low-Rated Responses", type="secondary"):
                 with db:
-                    # Get responses with low ratings
-                    db.cursor.execute("""
-                        SELECT DISTINCT r.id
-                        FROM responses r
-                        JOIN feedback f ON f.response_id = r.id
-                        WHERE f.rating <= %s;
-                    """, (max_rating,))
-                    low_rated_ids = [row['id'] for row in db.cursor.fetchall()]
-
-                    if low_rated_ids:
-                        deleted = db.delete_responses_batch(low_rated_ids)
-                        st.success(f"Deleted {deleted} responses with rating ≤ {max_rating}")
-                        st.rerun()
-                    else:
-                        st.info("No responses found with that rating")
+                    deleted = db.delete_low_rated_responses(max_rating)
+
+                if deleted:
+                    _invalidate_deleted_responses()
+                    st.success(f"Deleted {deleted} responses with rating ≤ {max_rating}")
+                    st.rerun(scope="fragment")
+                else:
+                    st.info("No responses found with that rating")
 
         st.markdown("---")
 
@@ -1487,20 +1689,40 @@ def data_management_page():
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                min_rating_filter = st.selectbox("Min Rating", options=[None, 1, 2, 3, 4, 5], index=0)
+                min_rating_filter = st.selectbox("Min Rating", options=[None, 1, 2, 3, 4, 5], index=0,
+                                                 on_change=_reset_response_pages)
             with col2:
-                max_rating_filter = st.selectbox("Max Rating", options=[None, 1, 2, 3, 4, 5], index=0)
+                max_rating_filter = st.selectbox("Max Rating", options=[None, 1, 2, 3, 4, 5], index=0,
+                                                 on_change=_reset_response_pages)
             with col3:
-                limit = st.number_input("Results per page", min_value=10, max_value=100, value=20, step=10)
+                limit = st.number_input("Results per page", min_value=10, max_value=100, value=20, step=10,
+                                        on_change=_reset_response_pages)
+
+        # Keyset pagination: one (created_at, id) cursor per page already passed
+        page_cursors = st.session_state.setdefault('resp_page_cursors', [])
 
         # Get responses with filters
         with db:
-            responses = db.get_all_responses(
+            responses = db.get_responses_summary(
                 limit=limit,
                 min_rating=min_rating_filter,
-                max_rating=max_rating_filter
+                max_rating=max_rating_filter,
+                before=page_cursors[-1] if page_cursors else None
             )
 
+        if page_cursors or len(responses) == limit:
+            col1, col2, col3 = st.columns([1, 1, 4])
+            with col1:
+                if st.button("⬅️ Previous", disabled=not page_cursors, use_container_width=True):
+                    page_cursors.pop()
+                    st.rerun(scope="fragment")
+            with col2:
+                if st.button("Next ➡️", disabled=len(responses) < limit, use_container_width=True):
+                    page_cursors.append((responses[-1]['created_at'], responses[-1]['id']))
+                    st.rerun(scope="fragment")
+            with col3:
+                st.caption(f"Page {len(page_cursors) + 1}")
+
         if responses:
             st.markdown(f"**Showing {len(responses)} responses**")
 
@@ -1508,53 +1730,65 @@ def data_management_page():
             if 'selected_responses' not in st.session_state:
                 st.session_state.selected_responses = set()
 
-            # Select all checkbox
-            select_all = st.checkbox("Select all on this page")
-            if select_all:
-                st.session_state.selected_responses.update([r['id'] for r in responses])
+            # Select all checkbox (the callback only runs when it is toggled)
+            st.session_state.current_page_ids = [r['id'] for r in responses]
+            st.checkbox("Select all on this page", key='select_all_page', on_change=_toggle_all_responses)
+
+            # Display responses as one editable grid; only the Select column is editable
+            df_responses = pd.DataFrame({
+                'Select': [r['id'] in st.session_state.selected_responses for r in responses],
+                'ID': [r['id'] for r in responses],
+                'Query': [r['query_text'] for r in responses],
+                'Rating': [r['avg_rating'] for r in responses],
+                'Comments': [r['comments_count'] for r in responses],
+                'Created': [r['created_at'] for r in responses],
+            })
+            edited = st.data_editor(
+                df_responses,
+                column_config={
+                    'Select': st.column_config.CheckboxColumn("Select", width="small"),
+                    'ID': st.column_config.NumberColumn("ID", width="small"),
+                    'Query': st.column_config.TextColumn("Query", width="large"),
+                    'Rating': st.column_config.NumberColumn("Avg Rating", format="%.1f ⭐"),
+                    'Comments': st.column_config.NumberColumn("💬"),
+                    'Created': st.column_config.DatetimeColumn("Created", format="MM/DD/YYYY hh:mm A"),
+                },
+                disabled=['ID', 'Query', 'Rating', 'Comments', 'Created'],
+                hide_index=True,
+                use_container_width=True,
+                key=f"resp_editor_{st.session_state.get('resp_editor_version', 0)}"
+            )
+            page_ids = set(st.session_state.current_page_ids)
+            st.session_state.selected_responses = (
+                (st.session_state.selected_responses - page_ids)
+                | set(edited.loc[edited['Select'], 'ID'].tolist())
+            )
 
-            # Delete selected button
+            # Delete selected button (after the grid so the count includes this run's edits)
             if st.session_state.selected_responses:
                 if st.button(f"🗑️ Delete {len(st.session_state.selected_responses)} Selected Responses", type="primary"):
                     with db:
                         deleted = db.delete_responses_batch(list(st.session_state.selected_responses))
+                    _invalidate_deleted_responses()
                     st.success(f"Deleted {deleted} responses")
+                    st.session_state.pop('select_all_page', None)
                     st.session_state.selected_responses.clear()
-                    st.rerun()
-
-            # Display responses as list
-            for i, response in enumerate(responses):
-                response_id = response['id']
+                    _reset_response_editor()
+                    st.rerun(scope="fragment")
 
-                # Build list item
-                has_comments = response.get('comments_count', 0) > 0
-                comment_indicator = f" | 💬 {response.get('comments_count', 0)}" if has_comments else ""
-
-                # Checkbox + Query + View button
-                col1, col2, col3 = st.columns([0.5, 5, 1])
-                with col1:
-                    is_selected = st.checkbox(
-                        "Select",
-                        value=response_id in st.session_state.selected_responses,
-                        key=f"select_{response_id}",
-                        label_visibility="collapsed"
-                    )
-                    if is_selected:
-                        st.session_state.selected_responses.add(response_id)
-                    else:
-                        st.session_state.selected_responses.discard(response_id)
-
-                with col2:
-                    st.markdown(f"**Q:** {response['query_text'][:100]}...")
-                    rating_display = '⭐' * int(response['avg_rating']) if response['avg_rating'] > 0 else 'No rating'
-                    st.caption(f"{rating_display}{comment_indicator} | {response['created_at'].strftime('%m/%d/%Y %I:%M %p')}")
-
-                with col3:
-                    if st.button("View", key=f"view_response_{response_id}"):
-                        show_response_dialog(response, db)
-
-                if i < len(responses) - 1:
-                    st.divider()
+            # Open a response in the details dialog
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                view_labels = {r['id']: f"#{r['id']} - {r['query_text'][:80]}" for r in responses}
+                view_id = st.selectbox(
+                    "Response details",
+                    options=st.session_state.current_page_ids,
+                    format_func=view_labels.get,
+                    label_visibility="collapsed"
+                )
+            with col2:
+                if st.button("View", use_container_width=True):
+                    show_response_dialog(view_id, db)
         else:
             st.info("No responses found with the selected filters")
 
@@ -1591,30 +1825,55 @@ def data_management_page():
                     try:
                         with db:
                             deleted_counts = db.delete_all_user_data()
-
-                        st.success(f"""
-                        **All user data has been deleted:**
-                        - 🗑️ {deleted_counts['queries']} queries
-                        - 🗑️ {deleted_counts['responses']} responses
-                        - 🗑️ {deleted_counts['feedback']} feedback items
-                        - 🗑️ {deleted_counts['document_flags']} document review flags
-                        - 🗑️ {deleted_counts['document_scores']} chunk-level scores reset
-                        - 🗑️ {deleted_counts['source_document_scores']} URL-level scores reset
-
-                        **System has been reset to fresh state with only source documents.**
-                        """)
+                        # Everything cached may reference deleted rows; cached fetchers
+                        # refetch lazily on the next rerun instead of forcing one now
+                        st.cache_data.clear()
+                        invalidate()
+                        st.session_state['data_reset_at'] = time.time()
+                        st.session_state.selected_responses = set()
+                        _reset_response_pages()
+
+                        # Refresh the counts already drawn at the top of the page
+                        _render_data_counts(counts_slot)
+
+                        st.success(DELETE_ALL_SUCCESS_TPL.format_map(deleted_counts))
                         st.balloons()
-                        st.rerun()
                     except Exception as delete_error:
                         st.error(f"Error deleting all data: {delete_error}")
-                        import traceback
+                        logger.exception("Error deleting all data")
                         st.code(traceback.format_exc())
 
     except Exception as e:
         st.error(f"Error in data management: {e}")
-        import traceback
+        logger.exception("Error in data management")
         st.code(traceback.format_exc())
 
+ABOUT_MD = """
+**Federal Reserve Public Correspondence Response System**
+
+This system provides responses to inquiries about Federal Reserve policies, operations, and monetary policy based on official sources.
+
+**Features:**
+- Submit policy inquiries
+- Professional formatted responses
+- Source citations and references
+- Response quality feedback
+- Analytics and insights
+
+📖 Visit **How It Works** to learn more about the system.
+"""
+
+# Sidebar label -> page renderer (insertion order is the navigation order).
+# Fragment-decorated pages plug in here unchanged; main() only looks them up.
+PAGES: Dict[str, Callable[[], None]] = {
+    "📨 Submit Inquiry": query_page,
+    "📝 Review Responses": review_page,
+    "📊 Analytics": analytics_page,
+    "📚 Source Content": source_management_page,
+    "ℹ️ How It Works": how_it_works_page,
+    "🗑️ Data Management": data_management_page,
+}
+
 def main():
     """Main application."""
 
@@ -1624,40 +1883,29 @@ def main():
 
     page = st.sidebar.radio(
         "Navigation",
-        ["📨 Submit Inquiry", "📝 Review Responses", "📊 Analytics", "📚 Source Content", "ℹ️ How It Works", "🗑️ Data Management"],
+        list(PAGES),
         label_visibility="collapsed"
     )
 
     st.sidebar.markdown("---")
     st.sidebar.markdown("### About")
-    st.sidebar.info("""
-    **Federal Reserve Public Correspondence Response System**
-
-    This system provides responses to inquiries about Federal Reserve policies, operations, and monetary policy based on official sources.
+    st.sidebar.info(ABOUT_MD)
 
-    **Features:**
-    - Submit policy inquiries
-    - Professional formatted responses
-    - Source citations and references
-    - Response quality feedback
-    - Analytics and insights
+    # Leaving the Review page stores any ratings still queued there
+    if PAGES[page] is not review_page and st.session_state.get('pending_feedback'):
+        try:
+            with st.spinner("Saving queued ratings..."):
+                _flush_pending_feedback()
+        except Exception as e:
+            logger.exception("Error saving queued ratings")
+            st.sidebar.error(f"Error saving queued ratings: {e}")
 
-    📖 Visit **How It Works** to learn more about the system.
-    """)
+    # Timed save of queued Review ratings, mounted only while the Review page has some queued
+    if PAGES[page] is review_page and st.session_state.get('pending_feedback'):
+        _autosave_pending_feedback()
 
     # Route to appropriate page
-    if page == "📨 Submit Inquiry":
-        query_page()
-    elif page == "📝 Review Responses":
-        review_page()
-    elif page == "📊 Analytics":
-        analytics_page()
-    elif page == "📚 Source Content":
-        source_management_page()
-    elif page == "ℹ️ How It Works":
-        how_it_works_page()
-    elif page == "🗑️ Data Management":
-        data_management_page()
+    PAGES[page]()
 
 if __name__ == "__main__":
     main()
@@ -1,65 +1,108 @@
 #!/usr/bin/env python3
-"""Test database connection to verify which database is being used"""
+"""Test database connection to verify which database is being used
+
+Usage:
+    python test_db_connection.py       # full report
+    python test_db_connection.py -q    # no output; exit code 0 if connected, 1 otherwise
+"""
 
 import os
+import sys
+import psycopg2
+from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
-load_dotenv()
+# One round trip: identity, numeric server version, and Supabase detection via the
+# extensions Supabase installs (pgsodium on older projects, supabase_vault on newer)
+CHECK_QUERY = """
+    SELECT
+        current_database() AS db,
+        current_user AS usr,
+        current_setting('server_version_num')::int AS v,
+        EXISTS (
+            SELECT 1 FROM pg_extension WHERE extname IN ('pgsodium', 'supabase_vault')
+        ) AS is_supabase;
+"""
 
-print("=" * 60)
-print("DATABASE CONNECTION TEST")
-print("=" * 60)
+BANNER = "=" * 60
 
-# Check what's in the environment
-database_url = os.getenv('DATABASE_URL')
-db_host = os.getenv('DB_HOST')
-db_name = os.getenv('DB_NAME')
+# application_name of the check's own connection, so it stands apart from the app in pg_stat_activity
+CHECK_APPLICATION_NAME = 'fed-rag-test'
 
-print(f"\nDATABASE_URL: {database_url[:50] if database_url else 'NOT SET'}...")
-print(f"DB_HOST: {db_host}")
-print(f"DB_NAME: {db_name}")
 
-if database_url:
-    if 'supabase' in database_url:
-        print("\n✅ Will connect to: SUPABASE")
-    elif 'localhost' in database_url:
-        print("\n⚠️  Will connect to: LOCAL PostgreSQL")
-    else:
-        print("\n🔍 Will connect to: UNKNOWN")
-else:
-    print("\n⚠️  DATABASE_URL not set - will use individual DB_* variables")
-    print(f"   → Connecting to: {db_host}:{os.getenv('DB_PORT')}/{db_name}")
-
-print("\n" + "=" * 60)
-
-# Now test actual connection
-print("\nTesting actual connection...")
-from database import Database
-
-db = Database()
-print(f"\nConnection params type: {type(db.conn_params)}")
-if isinstance(db.conn_params, str):
-    print(f"Connection string: {db.conn_params[:50]}...")
-else:
-    print(f"Connection dict: {db.conn_params}")
-
-try:
-    db.connect()
-    db.cursor.execute("SELECT current_database(), current_user, version();")
-    result = db.cursor.fetchone()
-    print(f"\n✅ Connected successfully!")
-    print(f"   Database: {result['current_database']}")
-    print(f"   User: {result['current_user']}")
-    print(f"   Version: {result['version'][:60]}...")
-
-    # Check if we're on Supabase
-    if 'supabase' in result['version'].lower() or 'supabase' in str(result):
-        print("\n🎉 Connected to SUPABASE!")
+def run_check(verbose: bool = True) -> bool:
+    """Connect with the app's settings and run CHECK_QUERY.
+
+    Args:
+        verbose: Print the connection report (each section is written in one call).
+
+    Returns:
+        True if the connection and query succeeded.
+    """
+    load_dotenv()
+    from database import Database
+
+    try:
+        db = Database()
+    except Exception as e:
+        if verbose:
+            print(f"❌ Invalid database configuration: {e}")
+        return False
+
+    params = db.conn_params
+    lines = [
+        BANNER,
+        "DATABASE CONNECTION TEST",
+        BANNER,
+        "",
+        f"DATABASE_MODE: {db.db_mode}",
+        f"Connecting to: {params['host']}:{params['port']}/{params['database']} as {params['user']}",
+    ]
+
+    # Supabase transaction-mode pooler (Supavisor) is the recommended endpoint for the app
+    if db.transaction_pooler:
+        lines.append(f"\n✅ Using transaction-mode pooler (port {params['port']}) - prepared statements disabled")
     else:
-        print("\n⚠️  Connected to LOCAL PostgreSQL")
+        lines.append(f"\n⚠️  Not on the transaction-mode pooler (port {params['port']}, pooler uses 6543)")
+
+    ok = False
+    conn = None
+    try:
+        # A dedicated connection rather than the app's pool, named explicitly instead of
+        # through the environment, so running the check inside the app changes nothing
+        conn = psycopg2.connect(**{**params, 'application_name': CHECK_APPLICATION_NAME},
+                                cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
+
+        # DEBUG_PG=1 also reports the server-side plan, timing and buffer usage
+        if os.getenv('DEBUG_PG') == '1':
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + CHECK_QUERY)
+            plan = cursor.fetchone()['QUERY PLAN'][0]
+            lines.append(f"\n🔍 Planning: {plan['Planning Time']:.3f} ms, Execution: {plan['Execution Time']:.3f} ms")
+            lines.append(f"   Shared buffers hit/read: {plan['Plan'].get('Shared Hit Blocks', 0)}/{plan['Plan'].get('Shared Read Blocks', 0)}")
+
+        cursor.execute(CHECK_QUERY)
+        result = cursor.fetchone()
+        ok = True
+        lines += [
+            "\n✅ Connected successfully!",
+            f"   Database: {result['db']}",
+            f"   User: {result['usr']}",
+            f"   PostgreSQL: {result['v'] // 10000}.{result['v'] % 10000}",
+            "\n🎉 Connected to SUPABASE!" if result['is_supabase'] else "\n⚠️  Connected to LOCAL PostgreSQL",
+        ]
+    except Exception as e:
+        lines.append(f"\n❌ Connection failed: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if verbose:
+        lines.append(BANNER)
+        print("\n".join(lines))
+
+    return ok
 
-    db.close()
-except Exception as e:
-    print(f"\n❌ Connection failed: {e}")
 
-print("=" * 60)
+if __name__ == "__main__":
+    sys.exit(0 if run_check(verbose='-q' not in sys.argv) else 1)